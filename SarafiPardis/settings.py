@@ -90,7 +90,17 @@ DATABASES = {
     }
 }
 
-# Caching - Removed: No caching is used in this application
+# Caching
+# Used by the dashboard context cache (dashboard/services.py) and template
+# editor previews. The file backend is shared by every worker process on this
+# host, so dashboard invalidation from one worker is seen by all of them.
+# Set DJANGO_CACHE_DIR to move it.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', str(BASE_DIR / '.django_cache')),
+    }
+}
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -154,6 +164,9 @@ EXTERNAL_API_KEY = os.environ.get(
     'EXTERNAL_API_KEY',
     'PX9k7mN2qR8vL4jH6wE3tY1uI5oP0aS9dF7gK2mN8xZ4cV6bQ1wE3rT5yU8iO0pL'
 )
+# Send all rates in one POST ({"api_key", "rates"}); falls back to one POST
+# per rate if the endpoint answers 404/405.
+EXTERNAL_API_BULK = os.environ.get('EXTERNAL_API_BULK', 'False').lower() in ('true', '1', 'yes')
 
 # Security settings
 if not DEBUG:
@@ -0,0 +1,60 @@
+"""
+Numeric kernels for the analytics dashboard.
+
+Series are packed CSR-style: ``prices`` is a flat float64 array and
+``offsets`` (int64, length ``n_series + 1``) marks where each series starts
+and ends. Every series must hold at least two points.
+
+When Numba is installed the slope kernel is JIT-compiled and runs the
+series in parallel; otherwise a vectorised NumPy implementation is used.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - numba is optional
+    njit = None
+
+
+def _trend_slopes_numpy(prices, offsets):
+    lengths = np.diff(offsets)
+    starts = np.repeat(offsets[:-1], lengths)
+    x_centered = (
+        np.arange(len(prices), dtype=np.float64)
+        - starts
+        - np.repeat((lengths - 1) / 2, lengths)
+    )
+    means = np.add.reduceat(prices, offsets[:-1]) / lengths
+    numerators = np.add.reduceat(
+        x_centered * (prices - np.repeat(means, lengths)), offsets[:-1]
+    )
+    # sum((i - x̄)²) for i in 0..n-1 has the closed form n(n²-1)/12.
+    denominators = lengths * (lengths * lengths - 1) / 12.0
+    return numerators / denominators
+
+
+def _trend_slopes_loop(prices, offsets):
+    n_series = len(offsets) - 1
+    out = np.empty(n_series, dtype=np.float64)
+    for s in prange(n_series):
+        start = offsets[s]
+        n = offsets[s + 1] - start
+        x_mean = (n - 1) / 2.0
+        y_mean = 0.0
+        for i in range(n):
+            y_mean += prices[start + i]
+        y_mean /= n
+        numerator = 0.0
+        denominator = 0.0
+        for i in range(n):
+            dx = i - x_mean
+            numerator += dx * (prices[start + i] - y_mean)
+            denominator += dx * dx
+        out[s] = numerator / denominator
+    return out
+
+
+if njit is not None:
+    trend_slopes = njit(parallel=True, cache=True)(_trend_slopes_loop)
+else:
+    trend_slopes = _trend_slopes_numpy
@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+import orjson
+from rest_framework.renderers import BaseRenderer
+
+
+def _default(obj):
+    # Match DRF's JSONEncoder: raw Decimals (e.g. inside DictField items) become floats.
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON renderer backed by orjson.
+
+    Drop-in replacement for DRF's ``JSONRenderer`` on read-heavy endpoints;
+    orjson serializes dicts/lists/datetimes natively and is considerably
+    faster than the stdlib encoder.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(
+            data,
+            default=_default,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z,
+        )
@@ -4,9 +4,20 @@ Moved out of views to keep views thin and testable.
 """
 import math
 from collections import defaultdict
-from datetime import timedelta
 
-from django.db.models import OuterRef, Subquery, Count
+import numpy as np
+from django.db.models import (
+    Avg,
+    Count,
+    FloatField,
+    Max,
+    Min,
+    OuterRef,
+    Q,
+    StdDev,
+    Subquery,
+)
+from django.db.models.functions import Cast
 from django.utils import timezone
 
 from category.models import PriceType, Category
@@ -17,6 +28,8 @@ from telegram_app.models import TelegramChannel
 
 from core.sorting import sort_gbp_price_types
 
+from ._kernels import trend_slopes
+
 
 ANALYTICS_PALETTE = [
     "#2563eb",
@@ -31,66 +44,86 @@ ANALYTICS_PALETTE = [
     "#0ea5e9",
 ]
 
+# Choice labels resolved once; equivalent to get_trade_type_display() per row.
+TRADE_DISPLAY = dict(PriceType.TRADE_CHOICES)
+SPECIAL_TRADE_DISPLAY = dict(SpecialPriceType.TRADE_CHOICES)
+
 
 def get_price_types_with_latest_prices():
-    latest_history = (
-        PriceHistory.objects.filter(price_type=OuterRef("pk"))
-        .order_by("-created_at")
-    )
-    previous_history = (
-        PriceHistory.objects.filter(price_type=OuterRef("pk"))
-        .order_by("-created_at")
-    )
+    # latest_price / previous_price / latest_price_at are denormalized onto
+    # PriceType and maintained by change_price.signals; the float copies
+    # save build_latest_cards a Decimal conversion per row.
     return (
         PriceType.objects.select_related(
             "category", "source_currency", "target_currency"
         )
         .annotate(
-            latest_price=Subquery(latest_history.values("price")[:1]),
-            latest_timestamp=Subquery(latest_history.values("created_at")[:1]),
-            previous_price=Subquery(previous_history.values("price")[1:2]),
+            latest_price_f=Cast("latest_price", FloatField()),
+            previous_price_f=Cast("previous_price", FloatField()),
         )
         .order_by("category__name", "name")
     )
 
 
-def build_timelines(price_types, window_start, palette=None):
-    palette = palette or ANALYTICS_PALETTE
+def _collect_series(rows):
+    """Group ``(owner_id, created_at, price)`` rows into per-owner column arrays."""
+    columns = defaultdict(lambda: ([], []))
+    for owner_id, created_at, price in rows:
+        timestamps, prices = columns[owner_id]
+        timestamps.append(created_at)
+        prices.append(price)
+    return {
+        owner_id: (timestamps, np.asarray(prices, dtype=np.float64))
+        for owner_id, (timestamps, prices) in columns.items()
+    }
+
+
+def build_price_series(price_types, window_start):
+    """
+    Return ``{price_type_id: (timestamps, prices)}`` for the window, where
+    ``prices`` is a float64 array. Shared by timelines and statistics so the
+    history rows are fetched once.
+    """
     relevant_ids = [pt.id for pt in price_types if pt.latest_price is not None]
     if not relevant_ids:
-        return []
-
-    history_qs = (
+        return {}
+    rows = (
         PriceHistory.objects.filter(
             price_type_id__in=relevant_ids, created_at__gte=window_start
         )
-        .select_related(
-            "price_type",
-            "price_type__category",
-            "price_type__source_currency",
-            "price_type__target_currency",
-        )
         .order_by("price_type_id", "created_at")
+        .values_list(
+            "price_type_id", "created_at", Cast("price", FloatField())
+        )
     )
+    return _collect_series(rows)
 
-    timeline_map = defaultdict(list)
-    for history in history_qs:
-        timestamp = timezone.localtime(history.created_at).isoformat()
-        timeline_map[history.price_type_id].append(
-            {"x": timestamp, "y": float(history.price)}
-        )
+
+def _series_to_points(timestamps, prices):
+    return [
+        {"x": timezone.localtime(timestamp), "y": price}
+        for timestamp, price in zip(timestamps, prices.tolist())
+    ]
+
+
+def build_timelines(price_types, window_start, palette=None, series=None):
+    palette = palette or ANALYTICS_PALETTE
+    if series is None:
+        series = build_price_series(price_types, window_start)
+    if not series:
+        return []
 
     datasets = []
     for index, price_type in enumerate(price_types):
-        data_points = timeline_map.get(price_type.id)
-        if not data_points:
+        columns = series.get(price_type.id)
+        if not columns:
             continue
         color = palette[index % len(palette)]
         datasets.append(
             {
-                "label": f"{price_type.source_currency.code}/{price_type.target_currency.code} {price_type.get_trade_type_display()}",
+                "label": f"{price_type.source_currency.code}/{price_type.target_currency.code} {TRADE_DISPLAY.get(price_type.trade_type, price_type.trade_type)}",
                 "category": price_type.category.name,
-                "data": data_points,
+                "data": _series_to_points(*columns),
                 "borderColor": color,
                 "backgroundColor": f"{color}33",
                 "tension": 0.35,
@@ -103,14 +136,10 @@ def build_timelines(price_types, window_start, palette=None):
 def build_latest_cards(price_types):
     cards = []
     for price_type in price_types:
-        if price_type.latest_price is None:
+        latest_price = price_type.latest_price_f
+        if latest_price is None:
             continue
-        latest_price = float(price_type.latest_price)
-        previous_price = (
-            float(price_type.previous_price)
-            if price_type.previous_price is not None
-            else None
-        )
+        previous_price = price_type.previous_price_f
         change_value = (
             latest_price - previous_price if previous_price is not None else None
         )
@@ -125,9 +154,9 @@ def build_latest_cards(price_types):
                 "name": price_type.name,
                 "category": price_type.category.name,
                 "pair": f"{price_type.source_currency.code}/{price_type.target_currency.code}",
-                "trade": price_type.get_trade_type_display(),
+                "trade": TRADE_DISPLAY.get(price_type.trade_type, price_type.trade_type),
                 "latest_price": latest_price,
-                "timestamp": price_type.latest_timestamp,
+                "timestamp": price_type.latest_price_at,
                 "change_value": change_value,
                 "change_percent": change_percent,
             }
@@ -175,9 +204,13 @@ def get_special_price_types_with_latest():
             "source_currency", "target_currency"
         )
         .annotate(
-            latest_price=Subquery(latest_history.values("price")[:1]),
+            latest_price=Cast(
+                Subquery(latest_history.values("price")[:1]), FloatField()
+            ),
             latest_timestamp=Subquery(latest_history.values("created_at")[:1]),
-            previous_price=Subquery(previous_history.values("price")[1:2]),
+            previous_price=Cast(
+                Subquery(previous_history.values("price")[1:2]), FloatField()
+            ),
             latest_cash_price=Subquery(latest_history.values("cash_price")[:1]),
             latest_account_price=Subquery(
                 latest_history.values("account_price")[:1]
@@ -195,37 +228,29 @@ def build_special_timelines(special_price_types, window_start, palette=None):
     if not relevant_ids:
         return []
 
-    history_qs = (
+    rows = (
         SpecialPriceHistory.objects.filter(
             special_price_type_id__in=relevant_ids,
             created_at__gte=window_start,
         )
-        .select_related(
-            "special_price_type",
-            "special_price_type__source_currency",
-            "special_price_type__target_currency",
-        )
         .order_by("special_price_type_id", "created_at")
-    )
-
-    timeline_map = defaultdict(list)
-    for history in history_qs:
-        timestamp = timezone.localtime(history.created_at).isoformat()
-        timeline_map[history.special_price_type_id].append(
-            {"x": timestamp, "y": float(history.price)}
+        .values_list(
+            "special_price_type_id", "created_at", Cast("price", FloatField())
         )
+    )
+    series = _collect_series(rows)
 
     datasets = []
     for index, special_price_type in enumerate(special_price_types):
-        data_points = timeline_map.get(special_price_type.id)
-        if not data_points:
+        columns = series.get(special_price_type.id)
+        if not columns:
             continue
         color = palette[(index + 5) % len(palette)]
         datasets.append(
             {
-                "label": f"{special_price_type.source_currency.code}/{special_price_type.target_currency.code} {special_price_type.get_trade_type_display()} (Special)",
+                "label": f"{special_price_type.source_currency.code}/{special_price_type.target_currency.code} {SPECIAL_TRADE_DISPLAY.get(special_price_type.trade_type, special_price_type.trade_type)} (Special)",
                 "category": "Special Prices",
-                "data": data_points,
+                "data": _series_to_points(*columns),
                 "borderColor": color,
                 "backgroundColor": f"{color}33",
                 "tension": 0.35,
@@ -241,12 +266,8 @@ def build_special_cards(special_price_types):
     for special_price_type in special_price_types:
         if special_price_type.latest_price is None:
             continue
-        latest_price = float(special_price_type.latest_price)
-        previous_price = (
-            float(special_price_type.previous_price)
-            if special_price_type.previous_price is not None
-            else None
-        )
+        latest_price = special_price_type.latest_price
+        previous_price = special_price_type.previous_price
         change_value = (
             latest_price - previous_price if previous_price is not None else None
         )
@@ -260,7 +281,7 @@ def build_special_cards(special_price_types):
                 "id": special_price_type.id,
                 "name": special_price_type.name,
                 "pair": f"{special_price_type.source_currency.code}/{special_price_type.target_currency.code}",
-                "trade": special_price_type.get_trade_type_display(),
+                "trade": SPECIAL_TRADE_DISPLAY.get(special_price_type.trade_type, special_price_type.trade_type),
                 "latest_price": latest_price,
                 "timestamp": special_price_type.latest_timestamp,
                 "change_value": change_value,
@@ -271,75 +292,96 @@ def build_special_cards(special_price_types):
     return cards
 
 
-def calculate_price_statistics(price_types, window_start):
-    stats = {}
-    for price_type in price_types:
-        if price_type.latest_price is None:
-            continue
-        histories = PriceHistory.objects.filter(
-            price_type=price_type, created_at__gte=window_start
-        ).order_by("created_at")
-        if histories.count() < 2:
-            continue
-        prices = [float(h.price) for h in histories]
-        n = len(prices)
-        avg_price = sum(prices) / n if n > 0 else 0
-        min_price = min(prices) if prices else 0
-        max_price = max(prices) if prices else 0
-        volatility = (
-            math.sqrt(
-                sum((p - avg_price) ** 2 for p in prices) / (n - 1)
-            )
-            if n > 1
-            else 0
+def aggregate_price_windows(price_type_ids, window_start):
+    """
+    Count/average/min/max/sample-stddev of prices per price type over the
+    window, computed by the database in a single GROUP BY.
+    """
+    if not price_type_ids:
+        return {}
+    price = Cast("price", FloatField())
+    rows = (
+        PriceHistory.objects.filter(
+            price_type_id__in=price_type_ids, created_at__gte=window_start
         )
-        price_stats = {
+        .order_by()
+        .values("price_type_id")
+        .annotate(
+            data_points=Count("id"),
+            average=Avg(price),
+            min=Min(price),
+            max=Max(price),
+            # SQLite's sample STDDEV raises on a single-row group, so take the
+            # population value and rescale it below (only n >= 2 is used).
+            volatility=StdDev(price),
+        )
+    )
+    windows = {}
+    for row in rows:
+        n = row["data_points"]
+        if n > 1 and row["volatility"] is not None:
+            row["volatility"] *= math.sqrt(n / (n - 1))
+        windows[row.pop("price_type_id")] = row
+    return windows
+
+
+def calculate_price_statistics(price_types, window_start, series=None):
+    relevant_ids = [pt.id for pt in price_types if pt.latest_price is not None]
+    aggregates = aggregate_price_windows(relevant_ids, window_start)
+    if series is None:
+        series = build_price_series(price_types, window_start)
+    eligible = [
+        price_type
+        for price_type in price_types
+        if price_type.id in aggregates
+        and len(series.get(price_type.id, ((), ()))[1]) >= 2
+    ]
+    if not eligible:
+        return {}
+
+    # The trend is a regression over sample order, which needs the ordered
+    # points rather than a SQL aggregate; all series go through one kernel call.
+    packed = [series[price_type.id][1] for price_type in eligible]
+    offsets = np.zeros(len(packed) + 1, dtype=np.int64)
+    np.cumsum([len(prices) for prices in packed], out=offsets[1:])
+    slopes = trend_slopes(np.concatenate(packed), offsets)
+
+    stats = {}
+    for price_type, slope in zip(eligible, slopes.tolist()):
+        window = aggregates[price_type.id]
+        stats[price_type.id] = {
             "price_type_id": price_type.id,
             "price_type_name": price_type.name,
             "category": price_type.category.name,
             "current_price": float(price_type.latest_price),
-            "average": avg_price,
-            "min": min_price,
-            "max": max_price,
-            "volatility": volatility,
-            "price_range": max_price - min_price,
-            "data_points": n,
-        }
-        if n > 1:
-            x = list(range(n))
-            x_mean = sum(x) / n
-            y_mean = avg_price
-            numerator = sum(
-                (x[i] - x_mean) * (prices[i] - y_mean) for i in range(n)
-            )
-            denominator = sum((x[i] - x_mean) ** 2 for i in range(n))
-            slope = numerator / denominator if denominator != 0 else 0
-            price_stats["trend_slope"] = slope
-            price_stats["trend_direction"] = (
+            "average": window["average"],
+            "min": window["min"],
+            "max": window["max"],
+            "volatility": window["volatility"],
+            "price_range": window["max"] - window["min"],
+            "data_points": window["data_points"],
+            "trend_slope": slope,
+            "trend_direction": (
                 "up"
                 if slope > 0.01
                 else ("down" if slope < -0.01 else "flat")
-            )
-        else:
-            price_stats["trend_slope"] = 0
-            price_stats["trend_direction"] = "flat"
-        stats[price_type.id] = price_stats
+            ),
+        }
     return stats
 
 
 def get_finalization_statistics(week_start):
-    total_finalizations = Finalization.objects.count()
-    week_finalizations = Finalization.objects.filter(
-        finalized_at__gte=week_start
-    ).count()
-    successful_telegram = Finalization.objects.filter(
-        message_sent=True
-    ).count()
-    failed_telegram = Finalization.objects.filter(message_sent=False).count()
-    special_finalizations = SpecialPriceFinalization.objects.count()
-    week_special = SpecialPriceFinalization.objects.filter(
-        finalized_at__gte=week_start
-    ).count()
+    week_filter = Q(finalized_at__gte=week_start)
+    finalization_counts = Finalization.objects.aggregate(
+        total_finalizations=Count("id"),
+        week_finalizations=Count("id", filter=week_filter),
+        successful_telegram=Count("id", filter=Q(message_sent=True)),
+        failed_telegram=Count("id", filter=Q(message_sent=False)),
+    )
+    special_counts = SpecialPriceFinalization.objects.aggregate(
+        special_finalizations=Count("id"),
+        week_special=Count("id", filter=week_filter),
+    )
     category_stats = (
         Finalization.objects.values("category__name")
         .annotate(count=Count("id"))
@@ -352,31 +394,26 @@ def get_finalization_statistics(week_start):
         .order_by("-count")[:5]
     )
     return {
-        "total_finalizations": total_finalizations,
-        "week_finalizations": week_finalizations,
-        "successful_telegram": successful_telegram,
-        "failed_telegram": failed_telegram,
-        "special_finalizations": special_finalizations,
-        "week_special": week_special,
+        **finalization_counts,
+        **special_counts,
         "category_stats": list(category_stats),
         "channel_stats": list(channel_stats),
     }
 
 
 def get_overall_statistics(price_types, special_price_types, week_start):
-    total_price_updates = PriceHistory.objects.count()
-    week_price_updates = PriceHistory.objects.filter(
-        created_at__gte=week_start
-    ).count()
-    total_special_updates = SpecialPriceHistory.objects.count()
-    week_special_updates = SpecialPriceHistory.objects.filter(
-        created_at__gte=week_start
-    ).count()
+    week_filter = Q(created_at__gte=week_start)
+    price_counts = PriceHistory.objects.aggregate(
+        total_price_updates=Count("id"),
+        week_price_updates=Count("id", filter=week_filter),
+    )
+    special_counts = SpecialPriceHistory.objects.aggregate(
+        total_special_updates=Count("id"),
+        week_special_updates=Count("id", filter=week_filter),
+    )
     return {
-        "total_price_updates": total_price_updates,
-        "week_price_updates": week_price_updates,
-        "total_special_updates": total_special_updates,
-        "week_special_updates": week_special_updates,
+        **price_counts,
+        **special_counts,
         "active_categories": Category.objects.count(),
         "active_price_types": PriceType.objects.count(),
         "active_special_types": SpecialPriceType.objects.count(),
@@ -388,22 +425,9 @@ def get_overall_statistics(price_types, special_price_types, week_start):
 
 def build_category_items():
     """Build category_id -> list of price item dicts for the pricing API."""
-    latest_history = (
-        PriceHistory.objects.filter(price_type=OuterRef("pk"))
-        .order_by("-created_at")
-    )
-    price_types = (
-        PriceType.objects.select_related(
-            "category", "source_currency", "target_currency"
-        )
-        .annotate(
-            latest_price=Subquery(latest_history.values("price")[:1]),
-            latest_timestamp=Subquery(
-                latest_history.values("created_at")[:1]
-            ),
-        )
-        .order_by("category__name", "name")
-    )
+    price_types = PriceType.objects.select_related(
+        "category", "source_currency", "target_currency"
+    ).order_by("category__name", "name")
     price_types_by_category = defaultdict(list)
     for pt in price_types:
         price_types_by_category[pt.category_id].append(pt)
@@ -426,9 +450,9 @@ def build_category_items():
                     "id": pt.id,
                     "name": pt.name,
                     "pair": f"{pt.source_currency.code}/{pt.target_currency.code}",
-                    "trade_type": pt.get_trade_type_display(),
+                    "trade_type": TRADE_DISPLAY.get(pt.trade_type, pt.trade_type),
                     "latest_price": pt.latest_price,
-                    "latest_price_timestamp": pt.latest_timestamp,
+                    "latest_price_timestamp": pt.latest_price_at,
                 }
             )
     return items_by_category
@@ -469,7 +493,7 @@ def build_special_price_items(cutoff):
             "id": spt.id,
             "name": spt.name,
             "pair": f"{spt.source_currency.code}/{spt.target_currency.code}",
-            "trade_type": spt.get_trade_type_display(),
+            "trade_type": SPECIAL_TRADE_DISPLAY.get(spt.trade_type, spt.trade_type),
             "latest_special_price": spt.latest_price,
             "latest_special_price_timestamp": spt.latest_timestamp,
             "is_double_price": getattr(spt, "is_double_price", False),
@@ -1,24 +1,21 @@
-import json
-from datetime import timedelta, datetime
+from datetime import timedelta
 
-from django.core.serializers.json import DjangoJSONEncoder
+import orjson
 from django.utils import timezone
 from django.views.generic import TemplateView
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from category.models import Category
+from .renderers import ORJSONRenderer
 from .serializers import PricingResponseSerializer
 from . import services as analysis_services
 
 
-class ChartJSONEncoder(DjangoJSONEncoder):
-    """Custom JSON encoder that ensures dates are in ISO format for Chart.js"""
-
-    def default(self, obj):
-        if isinstance(obj, datetime):
-            return timezone.localtime(obj).isoformat()
-        return super().default(obj)
+def _dumps_chart_data(data):
+    """Serialize chart payloads; datetimes are emitted as ISO strings for Chart.js."""
+    return orjson.dumps(data, option=orjson.OPT_NAIVE_UTC).decode()
 
 
 class AnalyticsDashboardView(TemplateView):
@@ -31,12 +28,15 @@ class AnalyticsDashboardView(TemplateView):
         palette = analysis_services.ANALYTICS_PALETTE
 
         price_types = analysis_services.get_price_types_with_latest_prices()
+        price_series = analysis_services.build_price_series(
+            price_types, window_start
+        )
         timelines = analysis_services.build_timelines(
-            price_types, window_start, palette=palette
+            price_types, window_start, palette=palette, series=price_series
         )
         latest_cards = analysis_services.build_latest_cards(price_types)
         price_statistics = analysis_services.calculate_price_statistics(
-            price_types, window_start
+            price_types, window_start, series=price_series
         )
 
         special_price_types = (
@@ -69,15 +69,9 @@ class AnalyticsDashboardView(TemplateView):
                 "price_statistics": price_statistics,
                 "finalization_stats": finalization_stats,
                 "overall_stats": overall_stats,
-                "timeline_data_json": json.dumps(
-                    timelines, cls=ChartJSONEncoder
-                ),
-                "special_timeline_data_json": json.dumps(
-                    special_timelines, cls=ChartJSONEncoder
-                ),
-                "category_summary_json": json.dumps(
-                    category_summary, cls=ChartJSONEncoder
-                ),
+                "timeline_data_json": _dumps_chart_data(timelines),
+                "special_timeline_data_json": _dumps_chart_data(special_timelines),
+                "category_summary_json": _dumps_chart_data(category_summary),
             }
         )
         return context
@@ -92,6 +86,7 @@ class PricingDataAPIView(APIView):
 
     authentication_classes = []
     permission_classes = []
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
 
     def get(self, request, *args, **kwargs):
         now = timezone.now()
@@ -3,7 +3,11 @@ from .models import Category
 def categories_processor(request):
     """
     A context processor to make categories available in all templates.
+
+    The queryset is lazy, so requests whose templates never touch
+    ``categories`` cost nothing. Only names/slugs are loaded; pages that
+    render price types pass their own queryset.
     """
     return {
-        'categories': Category.objects.prefetch_related('price_types').all()
-    }
\ No newline at end of file
+        'categories': Category.objects.only('id', 'name', 'slug')
+    }
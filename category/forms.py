@@ -19,24 +19,15 @@ class CategoryForm(forms.ModelForm):
 
 
 class PriceTypeForm(forms.ModelForm):
+    DUPLICATE_NAME_ERROR = 'A price type with this name already exists in this category.'
+
     def __init__(self, *args, **kwargs):
+        # Duplicate names within a category are rejected by the
+        # unique_category_pricetype_name constraint; views turn the resulting
+        # IntegrityError into DUPLICATE_NAME_ERROR instead of pre-querying.
         self.category = kwargs.pop('category', None)
         super().__init__(*args, **kwargs)
 
-    def clean(self):
-        cleaned_data = super().clean()
-        name = cleaned_data.get('name')
-
-        if self.category and name:
-            # Only check for duplicate name within the same category
-            if PriceType.objects.filter(
-                category=self.category,
-                name=name
-            ).exclude(pk=self.instance.pk if self.instance else None).exists():
-                self.add_error('name', 'A price type with this name already exists in this category.')
-
-        return cleaned_data
-
     class Meta:
         model = PriceType
         fields = ['name', 'source_currency', 'target_currency', 'trade_type', 'description']
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0009_rename_tether_category_and_update_descriptions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pricetype',
+            name='latest_price',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='pricetype',
+            name='latest_price_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='pricetype',
+            name='previous_price',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=20, null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0010_pricetype_latest_price_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pricetype',
+            index=models.Index(fields=['category', 'trade_type'], name='category_pr_categor_aedb55_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pricetype',
+            index=models.Index(fields=['source_currency', 'target_currency'], name='category_pr_source__34b652_idx'),
+        ),
+    ]
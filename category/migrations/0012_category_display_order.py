@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:41
+
+from django.db import migrations, models
+
+
+def _display_order(name):
+    """GBP=0, Tether=1, others=100 (the sort_categories rules at the time of this migration)."""
+    name = name or ""
+    lower = name.lower()
+    if "پوند" in name or "pound" in lower or "gbp" in lower:
+        return 0
+    if "تتر" in name or "سایر ارز" in name or "tether" in lower or "usdt" in lower:
+        return 1
+    return 100
+
+
+def populate_display_order(apps, schema_editor):
+    Category = apps.get_model("category", "Category")
+    categories = list(Category.objects.only("id", "name"))
+    for category in categories:
+        category.display_order = _display_order(category.name)
+    Category.objects.bulk_update(categories, ["display_order"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0011_pricetype_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='display_order',
+            field=models.SmallIntegerField(db_index=True, default=100, editable=False),
+        ),
+        migrations.RunPython(populate_display_order, migrations.RunPython.noop),
+    ]
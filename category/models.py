@@ -1,6 +1,18 @@
 from django.db import models
 from django.utils.text import slugify
 
+from core.sorting import category_display_order
+
+
+def _first_free_slug(base_slug, taken):
+    """Return base_slug, or base_slug-N with the smallest N not in taken."""
+    slug = base_slug
+    counter = 1
+    while slug in taken:
+        slug = f"{base_slug}-{counter}"
+        counter += 1
+    return slug
+
 
 class Currency(models.Model):
     code = models.CharField(max_length=10, unique=True)
@@ -19,6 +31,8 @@ class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
     slug = models.SlugField(max_length=120, unique=True, blank=True)
     description = models.TextField(blank=True, null=True)
+    # Derived from name on save; see core.sorting.order_categories
+    display_order = models.SmallIntegerField(default=100, db_index=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -30,16 +44,16 @@ class Category(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             base_slug = slugify(self.name) or "category"
-            slug = base_slug
-            counter = 1
-
-            # Loop until we find a unique slug
-            while Category.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-
-            self.slug = slug
-
+            # Fetch every candidate in one query, then pick the first free suffix
+            taken = set(
+                Category.objects.filter(slug__startswith=base_slug)
+                .exclude(pk=self.pk)
+                .order_by()
+                .values_list('slug', flat=True)
+            )
+            self.slug = _first_free_slug(base_slug, taken)
+
+        self.display_order = category_display_order(self.name)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -60,6 +74,10 @@ class PriceType(models.Model):
     )
     trade_type = models.CharField(max_length=10, choices=TRADE_CHOICES)
     description = models.TextField(blank=True, null=True)
+    # Denormalized from change_price.PriceHistory; kept current by change_price.signals.
+    latest_price = models.DecimalField(max_digits=20, decimal_places=2, null=True, blank=True, editable=False)
+    previous_price = models.DecimalField(max_digits=20, decimal_places=2, null=True, blank=True, editable=False)
+    latest_price_at = models.DateTimeField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -71,17 +89,22 @@ class PriceType(models.Model):
         constraints = [
             models.UniqueConstraint(fields=['category', 'name'], name='unique_category_pricetype_name'),
         ]
+        indexes = [
+            models.Index(fields=['category', 'trade_type']),
+            models.Index(fields=['source_currency', 'target_currency']),
+        ]
 
     def save(self, *args, **kwargs):
         # Ensure slug is unique within the same category
         if not self.slug:
             base_slug = slugify(self.name) or 'pricetype'
-            slug = base_slug
-            counter = 1
-            while PriceType.objects.filter(category=self.category, slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+            taken = set(
+                PriceType.objects.filter(category=self.category, slug__startswith=base_slug)
+                .exclude(pk=self.pk)
+                .order_by()
+                .values_list('slug', flat=True)
+            )
+            self.slug = _first_free_slug(base_slug, taken)
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -6,7 +6,7 @@ from django.dispatch import receiver
 from .models import Currency
 
 
-@receiver(post_migrate)
+@receiver(post_migrate, dispatch_uid='category:create_default_currencies')
 def create_default_currencies_on_startup(sender, **kwargs):
     """
     Ensure default currencies are created when the app starts.
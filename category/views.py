@@ -1,3 +1,5 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from .models import Category, PriceType
@@ -9,7 +11,15 @@ def category_dashboard(request):
 
     The template expects `categories` with `price_types` prefetched.
     """
-    categories = Category.objects.prefetch_related('price_types').all()
+    price_types = PriceType.objects.select_related(
+        'source_currency', 'target_currency'
+    ).only(
+        'id', 'name', 'slug', 'category_id', 'trade_type',
+        'source_currency__code', 'target_currency__code',
+    )
+    categories = Category.objects.only(
+        'id', 'name', 'slug', 'description'
+    ).prefetch_related(Prefetch('price_types', queryset=price_types))
     return render(request, 'category/category_dashboard.html', {'categories': categories})
 
 
@@ -51,20 +61,30 @@ def add_pricetype(request, category_pk):
         if form.is_valid():
             pt = form.save(commit=False)
             pt.category = category
-            pt.save()
-            return redirect('category:category_dashboard')
+            try:
+                with transaction.atomic():
+                    pt.save()
+            except IntegrityError:
+                form.add_error('name', PriceTypeForm.DUPLICATE_NAME_ERROR)
+            else:
+                return redirect('category:category_dashboard')
     else:
         form = PriceTypeForm(category=category)
     return render(request, 'category/pricetype_form.html', {'form': form, 'title': f'Add Price Type to {category.name}', 'category': category})
 
 
 def edit_pricetype(request, pk):
-    pt = get_object_or_404(PriceType, pk=pk)
+    pt = get_object_or_404(PriceType.objects.select_related('category'), pk=pk)
     if request.method == 'POST':
         form = PriceTypeForm(request.POST, instance=pt, category=pt.category)
         if form.is_valid():
-            form.save()
-            return redirect('category:category_dashboard')
+            try:
+                with transaction.atomic():
+                    form.save()
+            except IntegrityError:
+                form.add_error('name', PriceTypeForm.DUPLICATE_NAME_ERROR)
+            else:
+                return redirect('category:category_dashboard')
     else:
         form = PriceTypeForm(instance=pt, category=pt.category)
     return render(request, 'category/pricetype_form.html', {'form': form, 'title': 'Edit Price Type', 'category': pt.category})
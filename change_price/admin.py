@@ -1,11 +1,12 @@
 import io
+from collections import deque
 
 from django.contrib import admin, messages
-from django.db.models import F, Window
-from django.db.models.functions import Lag
+from django.db.models import OuterRef, Subquery
 from django.http import HttpResponse
 from django.utils import timezone
 from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 
 from template_editor.models import Template
@@ -18,6 +19,12 @@ BADGE_STYLE = (
     "display:inline-block;padding:2px 8px;border-radius:999px;font-size:11px;"
     "text-transform:uppercase;letter-spacing:0.05em;margin-right:6px;"
 )
+# BADGE_STYLE is a trusted constant, so it is baked into the markup once
+# instead of being escaped again by format_html() for every row.
+CATEGORY_BADGE_HTML = '<span style="' + BADGE_STYLE + 'background:#e8f5e9;color:#2e7d32;">{}</span>'
+TREND_BADGE_HTML = '<span style="' + BADGE_STYLE + 'background:{};color:#fff;">{} {}</span>'
+NO_TREND_BADGE = mark_safe('<span style="' + BADGE_STYLE + 'background:#eceff1;color:#546e7a;">n/a</span>')
+FLAT_TREND_BADGE = mark_safe('<span style="' + BADGE_STYLE + 'background:#eceff1;color:#546e7a;">= 0</span>')
 
 
 @admin.register(PriceHistory)
@@ -68,13 +75,17 @@ class PriceHistoryAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.annotate(
-            previous_price=Window(
-                expression=Lag("price"),
-                partition_by=[F("price_type")],
-                order_by=[F("created_at").asc()],
+        # Correlated lookup of the preceding row; served by the
+        # (price_type, -created_at) index for just the rows on the page.
+        previous = (
+            PriceHistory.objects.filter(
+                price_type=OuterRef("price_type"),
+                created_at__lt=OuterRef("created_at"),
             )
+            .order_by("-created_at")
+            .values("price")[:1]
         )
+        return qs.annotate(previous_price=Subquery(previous))
 
     # ------------------------------------------------------------------
     # Columns
@@ -83,11 +94,7 @@ class PriceHistoryAdmin(admin.ModelAdmin):
         category = obj.price_type.category
         if not category:
             return "—"
-        return format_html(
-            '<span style="{}background:#e8f5e9;color:#2e7d32;">{}</span>',
-            BADGE_STYLE,
-            category.name,
-        )
+        return format_html(CATEGORY_BADGE_HTML, category.name)
 
     category_badge.short_description = _("Category")
 
@@ -101,25 +108,14 @@ class PriceHistoryAdmin(admin.ModelAdmin):
     def trend_indicator(self, obj):
         previous = getattr(obj, "previous_price", None)
         if previous is None:
-            return format_html(
-                '<span style="{}background:#eceff1;color:#546e7a;">n/a</span>',
-                BADGE_STYLE,
-            )
+            return NO_TREND_BADGE
         delta = obj.price - previous
         if delta == 0:
-            return format_html(
-                '<span style="{}background:#eceff1;color:#546e7a;">= 0</span>',
-                BADGE_STYLE,
-            )
+            return FLAT_TREND_BADGE
         color = "#2e7d32" if delta > 0 else "#c62828"
         icon = "▲" if delta > 0 else "▼"
-        return format_html(
-            '<span style="{}background:{};color:#fff;">{icon} {value}</span>',
-            BADGE_STYLE,
-            color,
-            icon=icon,
-            value=format_price_dynamic(abs(delta)) if delta >= 0 else "-" + format_price_dynamic(abs(delta)),
-        )
+        value = format_price_dynamic(abs(delta))
+        return format_html(TREND_BADGE_HTML, color, icon, value if delta > 0 else "-" + value)
 
     trend_indicator.short_description = _("Change")
 
@@ -146,18 +142,23 @@ class PriceHistoryAdmin(admin.ModelAdmin):
     # Actions
     # ------------------------------------------------------------------
     def preview_with_template(self, request, queryset):
-        if not queryset.exists():
+        # Two distinct ids are enough to know the selection spans categories.
+        category_ids = list(
+            queryset.order_by()
+            .values_list("price_type__category_id", flat=True)
+            .distinct()[:2]
+        )
+        if not category_ids:
             self.message_user(request, _("Select at least one record."), level=messages.WARNING)
             return None
-        category_ids = queryset.values_list("price_type__category_id", flat=True).distinct()
-        if category_ids.count() > 1:
+        if len(category_ids) > 1:
             self.message_user(
                 request,
                 _("Select prices belonging to a single category to preview."),
                 level=messages.WARNING,
             )
             return None
-        category_id = category_ids.first()
+        category_id = category_ids[0]
         template = self._resolve_template(category_id)
         if not template:
             self.message_user(
@@ -167,6 +168,11 @@ class PriceHistoryAdmin(admin.ModelAdmin):
             )
             return None
 
+        queryset = queryset.select_related(
+            "price_type__category",
+            "price_type__source_currency",
+            "price_type__target_currency",
+        )
         data = self._build_dynamic_payload(template, queryset)
         image = render_template(template, data)
         buffer = io.BytesIO()
@@ -200,19 +206,33 @@ class PriceHistoryAdmin(admin.ModelAdmin):
             "category_name": template.category.name if template.category else "",
         }
         fields = (template.config or {}).get("fields", {})
-        buy_entries = [obj for obj in queryset if obj.price_type.trade_type == "buy"]
-        sell_entries = [obj for obj in queryset if obj.price_type.trade_type == "sell"]
-        fallback_entries = list(queryset)
+        # Each field consumes at most one entry per list, so stream the
+        # selection and stop as soon as every list holds len(fields) rows.
+        limit = len(fields)
+        fallback_entries = deque()
+        buy_entries = deque()
+        sell_entries = deque()
+        if limit:
+            for obj in queryset.iterator(chunk_size=500):
+                if len(fallback_entries) < limit:
+                    fallback_entries.append(obj)
+                trade_type = obj.price_type.trade_type
+                if trade_type == "buy" and len(buy_entries) < limit:
+                    buy_entries.append(obj)
+                elif trade_type == "sell" and len(sell_entries) < limit:
+                    sell_entries.append(obj)
+                if len(fallback_entries) == len(buy_entries) == len(sell_entries) == limit:
+                    break
 
         for field_name in fields.keys():
             key_lower = field_name.lower()
             entry = None
             if "buy" in key_lower and buy_entries:
-                entry = buy_entries.pop(0)
+                entry = buy_entries.popleft()
             elif "sell" in key_lower and sell_entries:
-                entry = sell_entries.pop(0)
+                entry = sell_entries.popleft()
             elif "price" in key_lower and fallback_entries:
-                entry = fallback_entries.pop(0)
+                entry = fallback_entries.popleft()
 
             if entry:
                 payload[field_name] = self._format_price(entry)
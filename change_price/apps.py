@@ -3,4 +3,8 @@ from django.apps import AppConfig
 
 class ChangePriceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'change_price'
\ No newline at end of file
+    name = 'change_price'
+
+    def ready(self):
+        # Import signal handlers
+        from . import signals  # noqa: F401
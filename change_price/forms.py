@@ -1,8 +1,39 @@
+import copy
+from functools import lru_cache
+
 from django import forms
 from .models import PriceHistory
 from category.models import Category, PriceType
 
 
+PRICE_INPUT_ATTRS = {
+    'class': 'form-control theme-input',
+    'step': '0.01',
+    'min': '0',
+}
+
+
+@lru_cache(maxsize=64)
+def _price_field_prototypes(price_type_key):
+    """Build the price fields once per distinct ((id, name), ...) tuple."""
+    return tuple(
+        (
+            f'price_{pk}',
+            forms.DecimalField(
+                label=f'Price - {name}',
+                min_value=0,
+                decimal_places=2,
+                required=False,
+                widget=forms.NumberInput(attrs=dict(
+                    PRICE_INPUT_ATTRS,
+                    placeholder=f'Enter new price for {name} (leave empty to keep current)',
+                ))
+            ),
+        )
+        for pk, name in price_type_key
+    )
+
+
 class CategoryPriceUpdateForm(forms.Form):
     def __init__(self, category, *args, price_types=None, **kwargs):
         super().__init__(*args, **kwargs)
@@ -12,22 +43,16 @@ class CategoryPriceUpdateForm(forms.Form):
         if price_types is not None:
             price_types = list(price_types)
         else:
-            price_types = list(PriceType.objects.filter(category=category))
-
-        # Create fields for each price type
-        for price_type in price_types:
-            self.fields[f'price_{price_type.id}'] = forms.DecimalField(
-                label=f'Price - {price_type.name}',
-                min_value=0,
-                decimal_places=2,
-                required=False,
-                widget=forms.NumberInput(attrs={
-                    'class': 'form-control theme-input',
-                    'placeholder': f'Enter new price for {price_type.name} (leave empty to keep current)',
-                    'step': '0.01',
-                    'min': '0'
-                })
+            # Only id and name are needed to build the fields
+            price_types = list(
+                PriceType.objects.filter(category=category).only('id', 'name').order_by('name')
             )
+
+        # Fields are cached per id/name set (a rename yields a new key); each
+        # form gets its own copies, like Django does for declared fields.
+        key = tuple((pt.id, pt.name) for pt in price_types)
+        for field_name, field in _price_field_prototypes(key):
+            self.fields[field_name] = copy.deepcopy(field)
     
     notes = forms.CharField(
         label='Notes',
@@ -0,0 +1,25 @@
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_latest_prices(apps, schema_editor):
+    PriceType = apps.get_model("category", "PriceType")
+    PriceHistory = apps.get_model("change_price", "PriceHistory")
+
+    history = PriceHistory.objects.filter(price_type=OuterRef("pk")).order_by("-created_at")
+    PriceType.objects.update(
+        latest_price=Subquery(history.values("price")[:1]),
+        latest_price_at=Subquery(history.values("created_at")[:1]),
+        previous_price=Subquery(history.values("price")[1:2]),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("change_price", "0002_replace_buy_sell_with_price"),
+        ("category", "0010_pricetype_latest_price_fields"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_latest_prices, migrations.RunPython.noop),
+    ]
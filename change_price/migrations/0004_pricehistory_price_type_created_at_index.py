@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0010_pricetype_latest_price_fields'),
+        ('change_price', '0003_backfill_pricetype_latest_prices'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pricehistory',
+            index=models.Index(fields=['price_type', '-created_at'], name='change_pric_price_t_7ed472_idx'),
+        ),
+    ]
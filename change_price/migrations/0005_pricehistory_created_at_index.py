@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0011_pricetype_filter_indexes'),
+        ('change_price', '0004_pricehistory_price_type_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pricehistory',
+            index=models.Index(fields=['-created_at'], name='change_pric_created_ba7c4b_idx'),
+        ),
+    ]
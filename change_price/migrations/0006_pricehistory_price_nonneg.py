@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0011_pricetype_filter_indexes'),
+        ('change_price', '0005_pricehistory_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pricehistory',
+            name='price',
+            field=models.DecimalField(decimal_places=2, max_digits=20),
+        ),
+        migrations.AddConstraint(
+            model_name='pricehistory',
+            constraint=models.CheckConstraint(condition=models.Q(('price__gte', 0)), name='pricehistory_price_nonneg'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0012_category_display_order'),
+        ('change_price', '0006_pricehistory_price_nonneg'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pricehistory',
+            index=models.Index(fields=['-price'], name='change_pric_price_fa2d3c_idx'),
+        ),
+    ]
@@ -1,11 +1,10 @@
 from django.db import models
-from django.core.validators import MinValueValidator
 from category.models import PriceType
 
 
 class PriceHistory(models.Model):
     price_type = models.ForeignKey(PriceType, on_delete=models.CASCADE, related_name='price_histories')
-    price = models.DecimalField(max_digits=20, decimal_places=2, validators=[MinValueValidator(0)])
+    price = models.DecimalField(max_digits=20, decimal_places=2)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     notes = models.TextField(blank=True, null=True)
@@ -14,6 +13,15 @@ class PriceHistory(models.Model):
         verbose_name = "Price History"
         verbose_name_plural = "Price Histories"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['price_type', '-created_at']),
+            # Dashboard "highest price" is order_by('-price').first()
+            models.Index(fields=['-price']),
+        ]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(price__gte=0), name='pricehistory_price_nonneg'),
+        ]
 
     def __str__(self):
         return f"{self.price_type.name} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
\ No newline at end of file
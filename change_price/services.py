@@ -0,0 +1,31 @@
+"""
+Helpers that keep the denormalized latest-price columns on PriceType in sync
+with PriceHistory.
+"""
+from django.db.models import OuterRef, Subquery
+
+from category.models import PriceType
+
+from .models import PriceHistory
+
+
+def refresh_latest_prices(price_type_ids):
+    """Recompute latest/previous price columns for the given price types in one UPDATE."""
+    history = PriceHistory.objects.filter(price_type=OuterRef("pk")).order_by("-created_at")
+    PriceType.objects.filter(pk__in=price_type_ids).update(
+        latest_price=Subquery(history.values("price")[:1]),
+        latest_price_at=Subquery(history.values("created_at")[:1]),
+        previous_price=Subquery(history.values("price")[1:2]),
+    )
+
+
+def latest_history_queryset():
+    """PriceHistory rows that are the newest one of their price type."""
+    newest = PriceHistory.objects.filter(price_type=OuterRef("price_type")).order_by("-created_at")
+    return PriceHistory.objects.filter(pk=Subquery(newest.values("pk")[:1]))
+
+
+def latest_price_histories(price_type_ids):
+    """Return {price_type_id: newest PriceHistory} for the given price types in one query."""
+    rows = latest_history_queryset().filter(price_type_id__in=price_type_ids).order_by()
+    return {row.price_type_id: row for row in rows}
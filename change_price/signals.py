@@ -0,0 +1,43 @@
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from category.models import PriceType
+
+from .models import PriceHistory
+from .services import refresh_latest_prices
+
+
+@receiver(post_save, sender=PriceHistory, dispatch_uid='change_price:latest_price_on_save')
+def update_latest_price_on_save(sender, instance, created, **kwargs):
+    """
+    Keep PriceType.latest_price / previous_price / latest_price_at current.
+    A new history row is always the newest one, so it simply shifts the
+    latest price into previous_price; edits fall back to a full recompute.
+    """
+    if created:
+        PriceType.objects.filter(pk=instance.price_type_id).update(
+            previous_price=F('latest_price'),
+            latest_price=instance.price,
+            latest_price_at=instance.created_at,
+        )
+    else:
+        refresh_latest_prices([instance.price_type_id])
+
+
+@receiver(post_delete, sender=PriceHistory, dispatch_uid='change_price:latest_price_on_delete')
+def update_latest_price_on_delete(sender, instance, origin=None, using=None, **kwargs):
+    """
+    Recompute the denormalized columns once per delete() call.
+    Cascades from a Category or PriceType remove the price type as well,
+    so only deletes that start at PriceHistory need maintaining.
+    """
+    if not (isinstance(origin, PriceHistory)
+            or (isinstance(origin, QuerySet) and origin.model is PriceHistory)):
+        return
+    pending = getattr(origin, '_latest_price_refresh_ids', None)
+    if pending is None:
+        pending = origin._latest_price_refresh_ids = set()
+        transaction.on_commit(lambda: refresh_latest_prices(pending), using=using)
+    pending.add(instance.price_type_id)
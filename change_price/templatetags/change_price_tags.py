@@ -1,9 +1,13 @@
 from django import template
-from django.utils import timezone
-from datetime import datetime
+from functools import lru_cache
 import pytz
 import re
 
+try:
+    import jdatetime
+except ImportError:  # to_jalali renders nothing without it
+    jdatetime = None
+
 from core.sorting import (
     sort_gbp_price_types,
     sort_tether_price_types,
@@ -13,6 +17,33 @@ from core.formatting import format_price_dynamic
 
 register = template.Library()
 
+TEHRAN_TZ = pytz.timezone('Asia/Tehran')
+UTC_TZ = pytz.UTC
+
+# Persian month names, indexed by month number (index 0 is unused)
+PERSIAN_MONTHS = (
+    '',
+    'فروردین', 'اردیبهشت', 'خرداد', 'تیر',
+    'مرداد', 'شهریور', 'مهر', 'آبان',
+    'آذر', 'دی', 'بهمن', 'اسفند',
+)
+
+# strftime-style tokens supported by to_jalali's free-form formats
+_JALALI_FORMAT_TOKENS = {
+    '%Y': '{year}',
+    '%m': '{month:02d}',
+    '%d': '{day:02d}',
+    '%H': '{hour:02d}',
+    '%M': '{minute:02d}',
+    '%S': '{second:02d}',
+    '%B': '{month_name}',
+}
+_JALALI_FORMAT_TOKEN_RE = re.compile('|'.join(map(re.escape, _JALALI_FORMAT_TOKENS)))
+
+_GBP_CATEGORY_RE = re.compile(r'پوند|pound|gbp', re.IGNORECASE)
+_GBP_WORD_RE = re.compile(r'\s*(?:پوند|pound|gbp)\s*', re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
 register.filter("sort_gbp_price_types", sort_gbp_price_types)
 register.filter("sort_tether_price_types", sort_tether_price_types)
 register.filter("sort_price_types_by_category", sort_price_types_by_category)
@@ -41,25 +72,20 @@ def clean_gbp_name(price_type_name, category_name=''):
     if not price_type_name:
         return price_type_name
     
-    # Check if this is a GBP category
-    category_lower = category_name.lower() if category_name else ''
-    is_gbp_category = 'پوند' in category_name or 'pound' in category_lower or 'gbp' in category_lower
-    
-    if not is_gbp_category:
+    # Only GBP categories are cleaned
+    if not category_name or not _is_gbp_category_name(category_name):
         return price_type_name
     
-    # Remove pound-related words from name
-    cleaned = price_type_name
-    # Remove 'پوند' (with spaces)
-    cleaned = cleaned.replace(' پوند ', ' ').replace('پوند ', '').replace(' پوند', '')
-    # Remove 'pound' (case insensitive, with spaces)
-    cleaned = re.sub(r'\s*pound\s*', ' ', cleaned, flags=re.IGNORECASE)
-    # Remove 'GBP' (with spaces)
-    cleaned = re.sub(r'\s*gbp\s*', ' ', cleaned, flags=re.IGNORECASE)
-    # Clean up multiple spaces
-    cleaned = ' '.join(cleaned.split())
-    
-    return cleaned.strip()
+    # Remove pound-related words, then collapse the leftover whitespace;
+    # a name made only of the currency word is kept as-is
+    cleaned = _WHITESPACE_RE.sub(' ', _GBP_WORD_RE.sub(' ', price_type_name)).strip()
+    return cleaned or price_type_name
+
+
+@lru_cache(maxsize=256)
+def _is_gbp_category_name(category_name):
+    """Category names are a small fixed set, so the check runs once per name."""
+    return _GBP_CATEGORY_RE.search(category_name) is not None
 
 
 @register.filter
@@ -68,7 +94,13 @@ def get_item(dictionary, key):
     Get an item from a dictionary using its key.
     Usage: {{ my_dict|get_item:key_variable }}
     """
-    return dictionary.get(str(key))
+    if dictionary is None:
+        return None
+    # Look the key up as-is first; only string-keyed dicts need str(key)
+    value = dictionary.get(key)
+    if value is None and not isinstance(key, str):
+        value = dictionary.get(str(key))
+    return value
 
 
 @register.filter
@@ -80,12 +112,10 @@ def get_form_field(form, field_name):
     try:
         if hasattr(form, field_name):
             return getattr(form, field_name)
-        # Try dictionary-style access for dynamically created fields
+        # Try dictionary-style access for dynamically created fields;
+        # form[name] reuses the BoundField Django caches on the form
         if hasattr(form, 'fields') and field_name in form.fields:
-            # Return a BoundField for the field
-            from django.forms.boundfield import BoundField
-            field = form.fields[field_name]
-            return BoundField(form, field, field_name)
+            return form[field_name]
         return None
     except (KeyError, AttributeError, TypeError):
         return None
@@ -100,63 +130,82 @@ def to_jalali(value, format_string="%Y/%m/%d %H:%M"):
     """
     if not value:
         return ""
-    
+    formatter = _jalali_formatter(format_string)
+    if formatter is None:
+        return ""
+    return _format_jalali(value, formatter)
+
+
+@register.simple_tag
+def jalali_column(objects, attr, format_string="%Y/%m/%d %H:%M"):
+    """
+    Pair every object with its `attr` datetime rendered like to_jalali, in one
+    Python pass (the formatter is resolved once for the whole column).
+    Usage: {% jalali_column histories "created_at" "short" as rows %}
+           {% for history, created_jalali in rows %}...{% endfor %}
+    """
+    formatter = _jalali_formatter(format_string)
+    if formatter is None:
+        return [(obj, "") for obj in objects]
+    return [(obj, _format_jalali(getattr(obj, attr), formatter)) for obj in objects]
+
+
+def _jalali_formatter(format_string):
+    """Named formats are a single dict hit; anything else is a strftime-style string."""
+    try:
+        return _NAMED_JALALI_FORMATS.get(format_string) or _compile_fmt(format_string)
+    except Exception:
+        return None
+
+
+def _format_jalali(value, formatter):
+    if not value or jdatetime is None:
+        return ""
+
     try:
-        # Import jdatetime
-        import jdatetime
-        
-        # Convert to Tehran timezone if timezone-aware
-        if timezone.is_aware(value):
-            tehran_tz = pytz.timezone('Asia/Tehran')
-            value_tehran = value.astimezone(tehran_tz)
+        # Convert to Tehran timezone (naive values are assumed to be UTC)
+        if value.tzinfo is not None:
+            value_tehran = value.astimezone(TEHRAN_TZ)
         else:
-            # If naive, assume it's in UTC and convert
-            utc_tz = pytz.UTC
-            tehran_tz = pytz.timezone('Asia/Tehran')
-            value_tehran = utc_tz.localize(value).astimezone(tehran_tz)
-        
+            value_tehran = UTC_TZ.localize(value).astimezone(TEHRAN_TZ)
+
         # Convert to Jalali
-        jalali_date = jdatetime.datetime.fromgregorian(value_tehran)
-        
-        # Format the Jalali date
-        # Persian month names
-        persian_months = {
-            1: 'فروردین', 2: 'اردیبهشت', 3: 'خرداد', 4: 'تیر',
-            5: 'مرداد', 6: 'شهریور', 7: 'مهر', 8: 'آبان',
-            9: 'آذر', 10: 'دی', 11: 'بهمن', 12: 'اسفند'
-        }
-        
-        # Format based on format_string
-        if format_string == "short":
-            # Short format: 1403/01/15 14:30
-            return jalali_date.strftime("%Y/%m/%d %H:%M")
-        elif format_string == "long":
-            # Long format with Persian month name: 15 فروردین 1403، 14:30
-            return f"{jalali_date.day} {persian_months[jalali_date.month]} {jalali_date.year}، {jalali_date.strftime('%H:%M')}"
-        elif format_string == "date_only":
-            # Date only: 1403/01/15
-            return jalali_date.strftime("%Y/%m/%d")
-        elif format_string == "time_only":
-            # Time only: 14:30
-            return jalali_date.strftime("%H:%M")
-        else:
-            # Default: use the format string (with Jalali replacements)
-            result = format_string
-            result = result.replace("%Y", str(jalali_date.year))
-            result = result.replace("%m", f"{jalali_date.month:02d}")
-            result = result.replace("%d", f"{jalali_date.day:02d}")
-            result = result.replace("%H", f"{jalali_date.hour:02d}")
-            result = result.replace("%M", f"{jalali_date.minute:02d}")
-            result = result.replace("%S", f"{jalali_date.second:02d}")
-            # Replace month number with Persian name if requested
-            if "%B" in result:
-                result = result.replace("%B", persian_months[jalali_date.month])
-            return result
-    except ImportError:
-        # If jdatetime is not installed, return empty string
-        return ""
-    except Exception as e:
+        jalali_date = jdatetime.datetime.fromgregorian(datetime=value_tehran)
+        return formatter(jalali_date)
+    except Exception:
         # Return empty string on any error
         return ""
 
 
+@lru_cache(maxsize=32)
+def _compile_fmt(format_string):
+    """Translate a to_jalali format string into a formatter, once per distinct format."""
+    escaped = format_string.replace('{', '{{').replace('}', '}}')
+    template_string = _JALALI_FORMAT_TOKEN_RE.sub(
+        lambda match: _JALALI_FORMAT_TOKENS[match.group()], escaped
+    )
+
+    def render(jalali_date):
+        return template_string.format(
+            year=jalali_date.year,
+            month=jalali_date.month,
+            day=jalali_date.day,
+            hour=jalali_date.hour,
+            minute=jalali_date.minute,
+            second=jalali_date.second,
+            month_name=PERSIAN_MONTHS[jalali_date.month],
+        )
+
+    return render
+
+
+_NAMED_JALALI_FORMATS = {
+    # Short format: 1403/01/15 14:30
+    "short": _compile_fmt("%Y/%m/%d %H:%M"),
+    # Long format with Persian month name: 15 فروردین 1403، 14:30
+    "long": lambda d: f"{d.day} {PERSIAN_MONTHS[d.month]} {d.year}، {d.hour:02d}:{d.minute:02d}",
+    # Date only: 1403/01/15
+    "date_only": _compile_fmt("%Y/%m/%d"),
+    # Time only: 14:30
+    "time_only": _compile_fmt("%H:%M"),
+}
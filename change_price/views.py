@@ -8,10 +8,11 @@ from django.views.decorators.http import require_GET
 from category.models import PriceType, Category, Currency
 from .models import PriceHistory
 from .forms import PriceUpdateForm, CategoryPriceUpdateForm
-from setting.utils import log_event
+from .services import latest_history_queryset, latest_price_histories, refresh_latest_prices
+from setting.utils import defer_log_event
 from core.sorting import (
     sort_gbp_price_types,
-    sort_categories,
+    order_categories,
     sort_price_types_by_category,
     tether_banner_price_types_for_update,
     is_tether_category,
@@ -53,6 +54,7 @@ def _sanitize_pound_update_price_types(price_types_qs):
                 # Merge history into the first buy-cash row and remove duplicate row.
                 pt.price_histories.update(price_type=kept_buy_cash)
                 pt.delete()
+                refresh_latest_prices([kept_buy_cash.id])
             continue
 
         keep.append(pt)
@@ -98,6 +100,7 @@ def _rehome_pure_pound_rows_from_tether() -> None:
         if duplicate:
             pt.price_histories.update(price_type=duplicate)
             pt.delete()
+            refresh_latest_prices([duplicate.id])
             continue
         try:
             pt.category = pound_cat
@@ -109,6 +112,7 @@ def _rehome_pure_pound_rows_from_tether() -> None:
             if existing:
                 pt.price_histories.update(price_type=existing)
                 pt.delete()
+                refresh_latest_prices([existing.id])
 
 
 def _ensure_tether_banner_rows(category) -> None:
@@ -257,6 +261,7 @@ def _ensure_tether_column_price_types() -> None:
             # Merge histories into existing row and remove duplicate source row.
             pt.price_histories.update(price_type=duplicate)
             pt.delete()
+            refresh_latest_prices([duplicate.id])
             continue
 
         try:
@@ -271,6 +276,7 @@ def _ensure_tether_column_price_types() -> None:
             if existing:
                 pt.price_histories.update(price_type=existing)
                 pt.delete()
+                refresh_latest_prices([existing.id])
 
 
 def price_dashboard(request):
@@ -282,13 +288,15 @@ def price_dashboard(request):
     categories = Category.objects.prefetch_related(
         Prefetch(
             'price_types',
-            queryset=PriceType.objects.prefetch_related('price_histories').select_related(
+            queryset=PriceType.objects.prefetch_related(
+                # Only the newest history row per type is displayed
+                Prefetch('price_histories', queryset=latest_history_queryset(), to_attr='latest_history_list')
+            ).select_related(
                 'source_currency', 'target_currency'
             )
         )
-    ).all()
-    
-    categories = sort_categories(categories)
+    )
+    categories = order_categories(categories)
     for category in categories:
         if "پوند" in category.name or "pound" in category.name.lower() or "gbp" in category.name.lower():
             category.display_price_types = _sanitize_pound_update_price_types(
@@ -306,10 +314,12 @@ def price_dashboard(request):
 
 
 def update_price(request, price_type_id):
-    price_type = get_object_or_404(PriceType, id=price_type_id)
+    price_type = get_object_or_404(PriceType.objects.select_related('category'), id=price_type_id)
     
-    # Get latest price history if exists
-    latest_price = PriceHistory.objects.filter(price_type=price_type).first()
+    # Get latest price history if exists (only the columns the view and template read)
+    latest_price = (
+        PriceHistory.objects.filter(price_type=price_type).only('price', 'updated_at').first()
+    )
     
     if request.method == 'POST':
         form = PriceUpdateForm(request.POST)
@@ -320,7 +330,7 @@ def update_price(request, price_type_id):
             price_history.save()
             
             # Log the price update
-            log_event(
+            defer_log_event(
                 level='INFO',
                 source='system',
                 message=f'Price updated for {price_type.name} ({price_type.category.name})',
@@ -377,10 +387,8 @@ def update_category_prices(request, category_id):
         )
 
     # Get latest prices for all price types
-    latest_prices = {
-        pt.id: PriceHistory.objects.filter(price_type=pt).first()
-        for pt in price_types
-    }
+    found = latest_price_histories([pt.id for pt in price_types])
+    latest_prices = {pt.id: found.get(pt.id) for pt in price_types}
     
     if request.method == 'POST':
         form = CategoryPriceUpdateForm(category, request.POST, price_types=price_types)
@@ -388,6 +396,7 @@ def update_category_prices(request, category_id):
             with transaction.atomic():
                 notes = form.cleaned_data.pop('notes')
                 updated_prices = []
+                new_rows = []
                 for price_type in price_types:
                     # Get the submitted price, or use the previous price if empty
                     submitted_price = form.cleaned_data.get(f'price_{price_type.id}')
@@ -404,15 +413,20 @@ def update_category_prices(request, category_id):
                         price = submitted_price
                     
                     old_price = latest_prices[price_type.id].price if latest_prices[price_type.id] else None
-                    PriceHistory.objects.create(
+                    new_rows.append(PriceHistory(
                         price_type=price_type,
                         price=price,
                         notes=notes
-                    )
+                    ))
                     updated_prices.append(f"{price_type.name}: {old_price} → {price}")
+
+                # One INSERT for the whole category; bulk_create skips the
+                # post_save signal, so refresh the denormalized latest prices here.
+                PriceHistory.objects.bulk_create(new_rows, batch_size=500)
+                refresh_latest_prices([row.price_type_id for row in new_rows])
             
             # Log the category price update
-            log_event(
+            defer_log_event(
                 level='INFO',
                 source='system',
                 message=f'Category prices updated: {category.name}',
@@ -3,6 +3,10 @@ Shared date/time helpers for Persian (Jalali) and English date formatting.
 """
 from __future__ import annotations
 
+from datetime import date
+from functools import lru_cache
+from typing import NamedTuple
+
 import jdatetime
 from django.utils import timezone
 
@@ -32,3 +36,32 @@ def get_farsi_weekday(timestamp) -> str:
 def get_english_weekday(timestamp) -> str:
     now = timezone.localtime(timestamp) if timestamp else timezone.localtime()
     return now.strftime("%A")
+
+
+class DateLabels(NamedTuple):
+    persian_date: str
+    english_date: str
+    farsi_weekday: str
+    english_weekday: str
+
+
+def format_all(timestamp) -> DateLabels:
+    """
+    All four labels above from one localtime() call, for callers that render
+    more than one of them for the same timestamp. The labels only depend on
+    the local calendar day, so they are built once per day.
+    """
+    now = timezone.localtime(timestamp) if timestamp else timezone.localtime()
+    return _date_labels_for_day(now.date())
+
+
+@lru_cache(maxsize=32)
+def _date_labels_for_day(day: date) -> DateLabels:
+    jalali = jdatetime.date.fromgregorian(date=day)
+    english_weekday = day.strftime("%A")
+    return DateLabels(
+        persian_date=to_farsi_digits(f"{jalali.day} {FARSI_MONTHS[jalali.month]} {jalali.year}"),
+        english_date=day.strftime("%B %d, %Y"),
+        farsi_weekday=FARSI_WEEKDAYS.get(english_weekday, ""),
+        english_weekday=english_weekday,
+    )
@@ -4,11 +4,12 @@ Single source of truth -- replaces duplicates in legacy_category_renderer,
 tether_renderer, special_offer_renderer, and publisher.
 """
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 
 
 FARSI_DIGITS = str.maketrans("0123456789", "۰۱۲۳۴۵۶۷۸۹")
 EN_DIGITS = str.maketrans("۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩", "01234567890123456789")
-PERSIAN_DIGITS = FARSI_DIGITS  # alias used by publisher.py
+PERSIAN_DIGITS = FARSI_DIGITS  # legacy alias of FARSI_DIGITS
 
 FARSI_WEEKDAYS = {
     "Saturday": "شنبه",
@@ -20,7 +21,7 @@ FARSI_WEEKDAYS = {
     "Friday": "جمعه",
 }
 
-FARSI_MONTHS = [
+FARSI_MONTHS = (
     "",
     "فروردین",
     "اردیبهشت",
@@ -34,14 +35,18 @@ FARSI_MONTHS = [
     "دی",
     "بهمن",
     "اسفند",
-]
+)
 
 
 def to_farsi_digits(value: str) -> str:
+    if isinstance(value, str):
+        return value.translate(FARSI_DIGITS)
     return str(value).translate(FARSI_DIGITS)
 
 
 def to_english_digits(value: str) -> str:
+    if isinstance(value, str):
+        return value.translate(EN_DIGITS)
     return str(value).translate(EN_DIGITS)
 
 
@@ -54,6 +59,16 @@ def farsi_month(index: int) -> str:
 def format_price_dynamic(value) -> str:
     """Format a price with dynamic decimals: 100 -> '100', 100.5 -> '100.5', 100.00 -> '100'.
     Returns comma-separated string with English digits."""
+    try:
+        return _format_price_cached(value)
+    except TypeError:  # unhashable input, format it uncached
+        return _format_price(value)
+
+
+def _format_price(value) -> str:
+    # Plain ints (not bools) need no Decimal round-trip
+    if type(value) is int:
+        return f"{value:,}"
     try:
         d = Decimal(str(value))
     except (InvalidOperation, TypeError):
@@ -62,8 +77,15 @@ def format_price_dynamic(value) -> str:
     if d == d.to_integral_value():
         return f"{int(d):,}"
 
-    normalized = d.normalize()
-    int_part = int(normalized)
-    frac_part = normalized - int_part
-    frac_str = str(frac_part).lstrip("0").lstrip(".")
-    return f"{int_part:,}.{frac_str}"
+    # Split the normalized digit tuple at the exponent instead of
+    # round-tripping the fractional part through str() and lstrip().
+    sign, digits, exponent = d.normalize().as_tuple()
+    frac_len = -exponent
+    digit_str = "".join(map(str, digits)).rjust(frac_len + 1, "0")
+    int_part = int(digit_str[:-frac_len])
+    return f"{'-' if sign else ''}{int_part:,}.{digit_str[-frac_len:]}"
+
+
+# The same prices are formatted many times per render; typed=True keeps
+# equal-but-differently-typed inputs (e.g. True vs 1) apart.
+_format_price_cached = lru_cache(maxsize=4096, typed=True)(_format_price)
@@ -5,8 +5,15 @@ finalize/views, and change_price/templatetags.
 """
 from __future__ import annotations
 
+import re
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
 from typing import Iterable, Sequence
 
+from django.db.models import Case, IntegerField, Q, QuerySet, Value, When
+from django.db.models.functions import Lower
+
 
 def _normalize_price_type_label(value: str) -> str:
     """Same rules as special_offer normalize_identifier (avoid cross-app import cycles)."""
@@ -30,6 +37,11 @@ TETHER_BANNER_UPDATE_NAME_ORDER: Sequence[str] = (
     "فروش تتر به پوند",
 )
 
+# Normalized banner label -> row position, built once.
+_TETHER_BANNER_RANKS = {
+    _normalize_price_type_label(n): i for i, n in enumerate(TETHER_BANNER_UPDATE_NAME_ORDER)
+}
+
 
 def is_tether_category(category) -> bool:
     cname = getattr(category, "name", None) or ""
@@ -61,21 +73,124 @@ def tether_banner_price_types_for_update(price_types) -> list:
     Only the five rows shown on the tether EUR/AED/TRY + GBP banner.
     Excludes IRR toman rows and stray GBP cash rows under tether category.
     """
-    allowed = {_normalize_price_type_label(n) for n in TETHER_BANNER_UPDATE_NAME_ORDER}
-    order_map = {
-        _normalize_price_type_label(n): i for i, n in enumerate(TETHER_BANNER_UPDATE_NAME_ORDER)
-    }
-    filtered = [
-        pt
-        for pt in price_types
-        if _normalize_price_type_label(getattr(pt, "name", "") or "") in allowed
-    ]
-    filtered.sort(
-        key=lambda pt: order_map.get(
-            _normalize_price_type_label(getattr(pt, "name", "") or ""), 99
+    ranked = []
+    for pt in price_types:
+        rank = _TETHER_BANNER_RANKS.get(
+            _normalize_price_type_label(getattr(pt, "name", "") or "")
         )
+        if rank is not None:
+            ranked.append((rank, pt))
+    ranked.sort(key=itemgetter(0))
+    return [pt for _rank, pt in ranked]
+
+
+# Every key the GBP/tether sorters can return, in ascending order.
+_SORT_KEY_ORDER = (1, 2, 3, 4, 5, 6, 7, 10, 20, 30)
+
+
+def _bucket_sort(items: Iterable, key) -> list:
+    """
+    Stable sort for the small fixed key set in _SORT_KEY_ORDER: one pass
+    into per-key buckets, then concatenate (same result as sorted()).
+    """
+    buckets = {k: [] for k in _SORT_KEY_ORDER}
+    for item in items:
+        buckets[key(item)].append(item)
+    return list(chain.from_iterable(buckets.values()))
+
+
+def _keyword_re(*keywords):
+    """One compiled alternation instead of a chain of `in` checks (same substring semantics)."""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+def _icontains_any(field: str, keywords) -> Q:
+    """SQL counterpart of _keyword_re(...).search(value.lower())."""
+    q = Q()
+    for kw in keywords:
+        q |= Q(**{f"{field}__icontains": kw})
+    return q
+
+
+def _is_unevaluated_queryset(price_types) -> bool:
+    """
+    True for a QuerySet that has not hit the DB yet, so ordering can be
+    pushed into its SELECT. Prefetched `.all()` results are already cached
+    and keep the in-Python sort.
+    """
+    return (
+        isinstance(price_types, QuerySet)
+        and price_types._result_cache is None
+        and not price_types.query.is_sliced
     )
-    return filtered
+
+
+def _order_by_rank(queryset, rank):
+    """Order by a CASE rank, keeping the queryset's own ordering as the tiebreak (like a stable sort)."""
+    tiebreak = queryset.query.order_by or queryset.model._meta.ordering
+    return queryset.order_by(rank, *tiebreak)
+
+
+# GBP sorter keywords, matched against the lowercased name (lowercasing
+# leaves Persian text unchanged). "نقد" also covers "نقدی".
+_CASH_KEYWORDS = ("نقد", "cash")
+_ACCOUNT_KEYWORDS = ("حساب", "account")
+_OFFICIAL_KEYWORDS = ("رسمی", "official")
+_CASH_RE = _keyword_re(*_CASH_KEYWORDS)
+_ACCOUNT_RE = _keyword_re(*_ACCOUNT_KEYWORDS)
+_OFFICIAL_RE = _keyword_re(*_OFFICIAL_KEYWORDS)
+
+
+@lru_cache(maxsize=512)
+def _gbp_sort_key(name: str, slug: str, trade_type: str) -> int:
+    """Sort key for sort_gbp_price_types; pure, so cached per (name, slug, trade_type)."""
+    slug_lower = slug.lower()
+    if "لیر" in name or slug_lower == "lira":
+        return 6
+    if "درهم" in name or slug_lower == "dirham":
+        return 7
+
+    # trade_type is a PriceType.TRADE_CHOICES value, already lowercase
+    name_lower = name.lower()
+    if trade_type == "buy":
+        if _CASH_RE.search(name_lower):
+            return 1
+        if _ACCOUNT_RE.search(name_lower):
+            return 2
+        return 10
+    if trade_type == "sell":
+        if _ACCOUNT_RE.search(name_lower):
+            return 3
+        if _CASH_RE.search(name_lower):
+            return 4
+        if _OFFICIAL_RE.search(name_lower):
+            return 5
+        return 20
+    return 30
+
+
+def _gbp_rank_expression() -> Case:
+    """_gbp_sort_key as a SQL CASE, evaluated in the SELECT that loads the rows."""
+    cash = _icontains_any("name", _CASH_KEYWORDS)
+    account = _icontains_any("name", _ACCOUNT_KEYWORDS)
+    official = _icontains_any("name", _OFFICIAL_KEYWORDS)
+    return Case(
+        When(Q(name__contains="لیر") | Q(slug__iexact="lira"), then=Value(6)),
+        When(Q(name__contains="درهم") | Q(slug__iexact="dirham"), then=Value(7)),
+        When(Q(trade_type="buy") & cash, then=Value(1)),
+        When(Q(trade_type="buy") & account, then=Value(2)),
+        When(trade_type="buy", then=Value(10)),
+        When(Q(trade_type="sell") & account, then=Value(3)),
+        When(Q(trade_type="sell") & cash, then=Value(4)),
+        When(Q(trade_type="sell") & official, then=Value(5)),
+        When(trade_type="sell", then=Value(20)),
+        default=Value(30),
+        output_field=IntegerField(),
+    )
+
+
+def _gbp_key(pt) -> int:
+    return _gbp_sort_key(pt.name, getattr(pt, "slug", "") or "", pt.trade_type)
 
 
 def sort_gbp_price_types(price_types):
@@ -88,40 +203,86 @@ def sort_gbp_price_types(price_types):
     5. فروش رسمی (Sell Official)
     6. لیر (Lira)
     7. درهم (Dirham)
+
+    The return type follows the input: an unevaluated QuerySet comes back
+    as a QuerySet ordered in SQL, anything else as a sorted list.
     """
-    if not price_types:
+    if _is_unevaluated_queryset(price_types):
+        return _order_by_rank(price_types, _gbp_rank_expression())
+    if not price_types or (isinstance(price_types, (list, tuple)) and len(price_types) == 1):
         return price_types
 
-    price_types_list = list(price_types)
-
-    def _key(pt):
-        name = pt.name
-        name_lower = name.lower()
-        slug_lower = (getattr(pt, "slug", "") or "").lower()
-        trade_type = pt.trade_type.lower()
-
-        if "لیر" in name or slug_lower == "lira":
-            return 6
-        if "درهم" in name or slug_lower == "dirham":
-            return 7
-
-        if trade_type == "buy":
-            if "نقدی" in name or "نقد" in name or "cash" in name_lower:
-                return 1
-            if "حساب" in name or "account" in name_lower:
-                return 2
-            return 10
-        if trade_type == "sell":
-            if "حساب" in name or "account" in name_lower:
-                return 3
-            if "نقد" in name or "cash" in name_lower:
-                return 4
-            if "رسمی" in name or "official" in name_lower:
-                return 5
-            return 20
+    return _bucket_sort(price_types, _gbp_key)
+
+
+# Tether sorter rules, checked in priority order:
+# (keywords in lowercased name, substrings of target code, keywords in target name, buy key, sell key)
+_TETHER_CURRENCY_KEYWORDS = (
+    (("پوند", "pound", "gbp"), ("gbp",), ("pound", "پوند"), 3, 4),
+    (("یورو", "euro", "eur"), ("eur",), ("euro", "یورو"), 5, 5),
+    (("لیر", "lira", "try"), ("try",), ("lira", "لیر"), 6, 6),
+    (("درهم", "dirham", "aed"), ("aed",), ("dirham", "درهم"), 7, 7),
+    (("تومان", "تومن", "toman", "tmn"), ("irr", "irt"), ("تومان", "تومن"), 1, 2),
+)
+_TETHER_CURRENCY_RULES = tuple(
+    (_keyword_re(*name_kws), _keyword_re(*code_kws), _keyword_re(*target_kws), buy_key, sell_key)
+    for name_kws, code_kws, target_kws, buy_key, sell_key in _TETHER_CURRENCY_KEYWORDS
+)
+
+
+@lru_cache(maxsize=512)
+def _tether_sort_key(name: str, trade_type: str, target_code: str, target_name: str) -> int:
+    """Sort key for sort_tether_price_types; pure, so cached per input tuple."""
+    # trade_type is a PriceType.TRADE_CHOICES value ("buy"/"sell"), already lowercase
+    if trade_type == "buy":
+        is_buy = True
+    elif trade_type == "sell":
+        is_buy = False
+    else:
         return 30
 
-    return sorted(price_types_list, key=_key)
+    name_lower = name.lower()
+    target_code = target_code.lower()
+    target_name = target_name.lower()
+    for name_re, code_re, target_re, buy_key, sell_key in _TETHER_CURRENCY_RULES:
+        if (
+            name_re.search(name_lower)
+            or code_re.search(target_code)
+            or target_re.search(target_name)
+        ):
+            return buy_key if is_buy else sell_key
+    return 10 if is_buy else 20
+
+
+def _tether_rank_expression() -> Case:
+    """_tether_sort_key as a SQL CASE, evaluated in the SELECT that loads the rows."""
+    buy_whens, sell_whens = [], []
+    for name_kws, code_kws, target_kws, buy_key, sell_key in _TETHER_CURRENCY_KEYWORDS:
+        matches = (
+            _icontains_any("name", name_kws)
+            | _icontains_any("target_currency__code", code_kws)
+            | _icontains_any("target_currency__name", target_kws)
+        )
+        buy_whens.append(When(Q(trade_type="buy") & matches, then=Value(buy_key)))
+        sell_whens.append(When(Q(trade_type="sell") & matches, then=Value(sell_key)))
+    return Case(
+        *buy_whens,
+        When(trade_type="buy", then=Value(10)),
+        *sell_whens,
+        When(trade_type="sell", then=Value(20)),
+        default=Value(30),
+        output_field=IntegerField(),
+    )
+
+
+def _tether_key(pt) -> int:
+    target = pt.target_currency
+    return _tether_sort_key(
+        pt.name,
+        pt.trade_type,
+        getattr(target, "code", "") if target else "",
+        target.name if target else "",
+    )
 
 
 def sort_tether_price_types(price_types):
@@ -134,97 +295,48 @@ def sort_tether_price_types(price_types):
     5. خرید/فروش تتر یورو (Buy/Sell Tether EUR)
     6. خرید/فروش تتر لیر (Buy/Sell Tether TRY)
     7. خرید/فروش تتر درهم (Buy/Sell Tether AED)
+
+    The return type follows the input: an unevaluated QuerySet comes back
+    as a QuerySet ordered in SQL, anything else as a sorted list.
     """
-    if not price_types:
+    if _is_unevaluated_queryset(price_types):
+        return _order_by_rank(price_types, _tether_rank_expression())
+    if not price_types or (isinstance(price_types, (list, tuple)) and len(price_types) == 1):
         return price_types
 
-    price_types_list = list(price_types)
+    return _bucket_sort(price_types, _tether_key)
 
-    def _key(pt):
-        name_lower = pt.name.lower()
-        trade_type = pt.trade_type.lower()
-        target_code = (
-            getattr(pt.target_currency, "code", "").lower()
-            if pt.target_currency
-            else ""
-        )
-        target_name = (
-            pt.target_currency.name.lower() if pt.target_currency else ""
-        )
-
-        has_toman = (
-            any(kw in name_lower for kw in ("تومان", "تومن", "toman", "tmn"))
-            or any(kw in target_code for kw in ("irr", "irt"))
-            or "تومان" in target_name
-            or "تومن" in target_name
-        )
-        has_gbp = (
-            any(kw in name_lower for kw in ("پوند", "pound", "gbp"))
-            or "gbp" in target_code
-            or "pound" in target_name
-            or "پوند" in target_name
-        )
-        has_eur = (
-            any(kw in name_lower for kw in ("یورو", "euro", "eur"))
-            or "eur" in target_code
-            or "euro" in target_name
-            or "یورو" in target_name
-        )
-        has_try = (
-            any(kw in name_lower for kw in ("لیر", "lira", "try"))
-            or "try" in target_code
-            or "lira" in target_name
-            or "لیر" in target_name
-        )
-        has_aed = (
-            any(kw in name_lower for kw in ("درهم", "dirham", "aed"))
-            or "aed" in target_code
-            or "dirham" in target_name
-            or "درهم" in target_name
-        )
-
-        if trade_type == "buy":
-            if has_gbp:
-                return 3
-            if has_eur:
-                return 5
-            if has_try:
-                return 6
-            if has_aed:
-                return 7
-            if has_toman:
-                return 1
-            return 10
-        if trade_type == "sell":
-            if has_gbp:
-                return 4
-            if has_eur:
-                return 5
-            if has_try:
-                return 6
-            if has_aed:
-                return 7
-            if has_toman:
-                return 2
-            return 20
-        return 30
-
-    return sorted(price_types_list, key=_key)
-
-
-def sort_price_types_by_category(price_types, category_name: str):
-    """Dispatch to the right sorter based on category name."""
-    if not price_types or not category_name:
-        return price_types
 
+@lru_cache(maxsize=256)
+def _classify_category(category_name: str) -> str:
+    """Return 'tether', 'gbp' or '' for a category name (names are a small, stable set)."""
     lower = category_name.lower()
     if any(kw in category_name for kw in ("تتر", "سایر ارز")) or any(
         kw in lower for kw in ("tether", "usdt")
     ):
-        return sort_tether_price_types(price_types)
+        return "tether"
     if any(kw in category_name for kw in ("پوند",)) or any(
         kw in lower for kw in ("pound", "gbp")
     ):
+        return "gbp"
+    return ""
+
+
+def sort_price_types_by_category(price_types, category_name: str):
+    """
+    Dispatch to the right sorter based on category name. Unevaluated
+    QuerySets are passed through without a truthiness check so the
+    sorters can still order them in SQL (and return a QuerySet).
+    """
+    if not category_name:
+        return price_types
+    if not _is_unevaluated_queryset(price_types) and not price_types:
+        return price_types
+
+    kind = _classify_category(category_name)
+    if kind == "tether":
+        return sort_tether_price_types(price_types)
+    if kind == "gbp":
         return sort_gbp_price_types(price_types)
     return price_types
 
@@ -232,12 +344,29 @@ def sort_price_types_by_category(price_types, category_name: str):
 def sort_categories(categories: Iterable) -> list:
     """Sort categories: GBP/Pound first, then Tether/USDT, then others alphabetically."""
 
-    def _key(cat):
-        name = (cat.name or "").lower()
-        if "پوند" in cat.name or "pound" in name or "gbp" in name:
-            return (0, name)
-        if "تتر" in cat.name or "سایر ارز" in cat.name or "tether" in name or "usdt" in name:
-            return (1, name)
-        return (2, name)
+    return sorted(categories, key=_category_key)
+
+
+def category_display_order(category_name: str) -> int:
+    """Rank persisted on Category.display_order (GBP=0, Tether=1, others=100)."""
+    return _category_sort_key(category_name or "")[0]
+
+
+def order_categories(queryset):
+    """sort_categories in SQL: by the persisted display_order, then lowercased name."""
+    return queryset.order_by("display_order", Lower("name"), "name")
+
+
+def _category_key(cat) -> tuple:
+    return _category_sort_key(cat.name)
+
 
-    return sorted(categories, key=_key)
+@lru_cache(maxsize=256)
+def _category_sort_key(category_name: str) -> tuple:
+    """(rank, lowercased name) for sort_categories; cached per name."""
+    name = (category_name or "").lower()
+    if "پوند" in category_name or "pound" in name or "gbp" in name:
+        return (0, name)
+    if "تتر" in category_name or "سایر ارز" in category_name or "tether" in name or "usdt" in name:
+        return (1, name)
+    return (100, name)
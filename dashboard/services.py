@@ -2,8 +2,26 @@
 Dashboard business logic: home and dashboard2 context building.
 Keeps views thin and logic testable.
 """
+import uuid
+from collections import defaultdict
 from datetime import timedelta
-from django.db.models import Prefetch, Count
+from operator import attrgetter
+
+from django.core.cache import cache
+from django.db.models import (
+    Avg,
+    Count,
+    Exists,
+    F,
+    FloatField,
+    Max,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Window,
+)
+from django.db.models.functions import Abs, Cast, RowNumber
 from django.utils import timezone
 
 from category.models import Category, PriceType
@@ -11,221 +29,217 @@ from change_price.models import PriceHistory
 from telegram_app.models import TelegramBot, TelegramChannel
 from special_price.models import SpecialPriceType, SpecialPriceHistory
 
-from core.sorting import sort_categories
+from core.sorting import order_categories
 
+# Rendered contexts are reused for at most this long; it also bounds how far
+# the rolling 24h / 7-day windows can drift on a cache hit.
+# invalidate_dashboard_cache() bumps a key in the default cache, so it only
+# reaches the workers that share that backend (settings.CACHES uses a
+# host-wide file cache). With a per-process backend such as LocMemCache,
+# other workers keep serving their context for up to this long after edits
+# that do not change the newest PriceHistory timestamp.
+DASHBOARD_CACHE_TIMEOUT = 60
+_CACHE_GENERATION_KEY = "dashboard:generation"
 
-def get_home_context():
-    """Build context for dashboard/dashboard.html (home)."""
-    categories = Category.objects.prefetch_related(
-        "price_types",
-        "price_types__price_histories",
-    ).all()
-    now = timezone.now()
-    twenty_four_hours_ago = now - timedelta(hours=24)
 
-    highest_price_obj = (
-        PriceHistory.objects.select_related("price_type")
-        .order_by("-price")
-        .first()
-    )
-    highest_price = float(highest_price_obj.price) if highest_price_obj else 0
-    highest_price_label = (
-        highest_price_obj.price_type.name if highest_price_obj else "N/A"
+def invalidate_dashboard_cache():
+    """Make the next home/dashboard2 request rebuild its context."""
+    cache.set(_CACHE_GENERATION_KEY, uuid.uuid4().hex, None)
+
+
+def _cached_context(name, build):
+    """
+    Serve `build()` from the cache. The key carries the newest PriceHistory
+    timestamp, so new prices (bulk_create included) show up immediately;
+    edits to other models bump the generation via dashboard.signals.
+    """
+    latest = PriceHistory.objects.aggregate(latest=Max("created_at"))["latest"]
+    key = "dashboard:{}:{}:{}".format(
+        name,
+        cache.get(_CACHE_GENERATION_KEY, ""),
+        latest.timestamp() if latest else "",
     )
+    return cache.get_or_set(key, build, DASHBOARD_CACHE_TIMEOUT)
 
-    price_changes = []
-    price_types = PriceType.objects.prefetch_related("price_histories").all()
-    for price_type in price_types:
-        latest = price_type.price_histories.first()
-        if not latest:
-            continue
-        old = (
-            price_type.price_histories.filter(
-                created_at__lte=twenty_four_hours_ago
+
+def get_home_context():
+    """Context for dashboard/dashboard.html (home), cached."""
+    return _cached_context("home", _build_base_context)
+
+
+def get_dashboard2_context():
+    """Context for dashboard/dashboard2.html, cached."""
+    return _cached_context("dashboard2", _build_dashboard2_context)
+
+
+def _price_change_summary(cutoff):
+    """
+    Average and biggest change of the price types updated after `cutoff`,
+    each measured against its last price at or before `cutoff`.
+
+    Runs as a single query returning one row: the latest price comes from
+    the denormalized PriceType columns, the old one from a correlated
+    subquery, and the average is a window over the whole filtered set.
+
+    Returns (avg_change_percent, biggest_change).
+    """
+    old_prices = PriceHistory.objects.filter(
+        price_type=OuterRef("pk"), created_at__lte=cutoff
+    ).order_by("-created_at")
+    biggest = (
+        PriceType.objects.filter(latest_price_at__gt=cutoff)
+        .annotate(old_price=Subquery(old_prices.values("price")[:1]))
+        .filter(old_price__gt=0)
+        .annotate(
+            change_percent=(
+                Cast("latest_price", FloatField()) - Cast("old_price", FloatField())
             )
-            .order_by("-created_at")
-            .first()
+            * 100
+            / Cast("old_price", FloatField()),
         )
-        if (
-            old
-            and latest.created_at > twenty_four_hours_ago
-            and float(old.price) > 0
-        ):
-            current_price = float(latest.price)
-            old_price = float(old.price)
-            change_percent = (
-                (current_price - old_price) / old_price
-            ) * 100
-            price_changes.append({
-                "name": price_type.name,
-                "current": current_price,
-                "old": old_price,
-                "change_percent": change_percent,
-                "change_amount": current_price - old_price,
-            })
-
-    avg_24h_change = (
-        sum(p["change_percent"] for p in price_changes) / len(price_changes)
-        if price_changes
-        else 0
+        .annotate(avg_change=Window(Avg("change_percent")))
+        .order_by(Abs("change_percent").desc(), "name")
+        .values(
+            "name", "latest_price", "old_price", "change_percent", "avg_change",
+            "category__name",
+        )
+        .first()
     )
-    biggest_change = (
-        max(price_changes, key=lambda x: abs(x["change_percent"]))
-        if price_changes
-        else None
+    if biggest is None:
+        return 0, None
+
+    current = float(biggest["latest_price"])
+    old = float(biggest["old_price"])
+    biggest_change = {
+        "name": biggest["name"],
+        "current": current,
+        "old": old,
+        "change_percent": biggest["change_percent"],
+        "change_amount": current - old,
+        "category": biggest["category__name"] or "Uncategorized",
+    }
+    return biggest["avg_change"], biggest_change
+
+
+def _build_base_context():
+    """
+    Metrics shared by both dashboards; this is the whole home context and
+    the base that dashboard2 layers its charts on.
+    """
+    # The dashboards only show how many price types each category has
+    categories = Category.objects.annotate(price_type_count=Count("price_types"))
+    now = timezone.now()
+    twenty_four_hours_ago = now - timedelta(hours=24)
+
+    highest = (
+        PriceHistory.objects.order_by("-price")
+        .values_list("price", "price_type__name")
+        .first()
     )
+    highest_price = float(highest[0]) if highest else 0
+    highest_price_label = highest[1] if highest else "N/A"
+
+    avg_24h_change, biggest_change = _price_change_summary(twenty_four_hours_ago)
 
+    # Only the newest history row per special price type is displayed
+    newest_special = SpecialPriceHistory.objects.filter(
+        special_price_type=OuterRef("special_price_type")
+    ).order_by("-created_at")
     special_price_types = SpecialPriceType.objects.prefetch_related(
         Prefetch(
             "special_price_histories",
-            queryset=SpecialPriceHistory.objects.order_by("-created_at"),
+            queryset=SpecialPriceHistory.objects.filter(
+                pk=Subquery(newest_special.values("pk")[:1])
+            ),
+            to_attr="latest_history_list",
         )
     ).select_related("source_currency", "target_currency").all()
 
-    latest_update = (
-        PriceHistory.objects.select_related("price_type")
-        .order_by("-created_at")
-        .first()
+    # One round-trip per model for the scalar counters
+    bot_counts = TelegramBot.objects.aggregate(
+        total=Count("id"), active=Count("id", filter=Q(is_active=True))
+    )
+    channel_counts = TelegramChannel.objects.aggregate(
+        total=Count("id"), active=Count("id", filter=Q(is_active=True))
+    )
+    history_stats = PriceHistory.objects.aggregate(
+        total=Count("id"),
+        recent=Count("id", filter=Q(created_at__gte=twenty_four_hours_ago)),
+        latest_time=Max("created_at"),
     )
 
     return {
-        "categories": sort_categories(categories),
+        "categories": order_categories(categories),
         "special_price_types": special_price_types,
         "highest_price": highest_price,
         "highest_price_label": highest_price_label,
         "avg_24h_change": avg_24h_change,
         "biggest_change": biggest_change,
-        "total_bots": TelegramBot.objects.count(),
-        "active_bots": TelegramBot.objects.filter(is_active=True).count(),
-        "total_channels": TelegramChannel.objects.count(),
-        "active_channels": TelegramChannel.objects.filter(
-            is_active=True
-        ).count(),
+        "total_bots": bot_counts["total"],
+        "active_bots": bot_counts["active"],
+        "total_channels": channel_counts["total"],
+        "active_channels": channel_counts["active"],
         "total_price_types": PriceType.objects.count(),
-        "total_price_updates": PriceHistory.objects.count(),
-        "latest_update_time": (
-            latest_update.created_at if latest_update else None
-        ),
-        "recent_updates": PriceHistory.objects.filter(
-            created_at__gte=twenty_four_hours_ago
-        ).count(),
+        "total_price_updates": history_stats["total"],
+        "latest_update_time": history_stats["latest_time"],
+        "recent_updates": history_stats["recent"],
     }
 
 
-def get_dashboard2_context():
+def _build_dashboard2_context():
     """Build context for dashboard/dashboard2.html (charts and enhanced metrics)."""
-    categories = Category.objects.prefetch_related(
-        "price_types",
-        "price_types__price_histories",
-    ).all()
+    context = dict(get_home_context())
     now = timezone.now()
     twenty_four_hours_ago = now - timedelta(hours=24)
 
-    highest_price_obj = (
-        PriceHistory.objects.select_related("price_type")
-        .order_by("-price")
-        .first()
-    )
-    highest_price = float(highest_price_obj.price) if highest_price_obj else 0
-    highest_price_label = (
-        highest_price_obj.price_type.name if highest_price_obj else "N/A"
-    )
-
-    price_changes = []
-    price_types = PriceType.objects.prefetch_related("price_histories").all()
-    for price_type in price_types:
-        latest = price_type.price_histories.first()
-        if not latest:
-            continue
-        old = (
-            price_type.price_histories.filter(
-                created_at__lte=twenty_four_hours_ago
+    # First ten price types (by name) updated in the last 24h, then the
+    # oldest 50 of those updates per type, all in one windowed query.
+    top_price_types = list(
+        PriceType.objects.filter(
+            Exists(
+                PriceHistory.objects.filter(
+                    price_type=OuterRef("pk"),
+                    created_at__gte=twenty_four_hours_ago,
+                )
             )
-            .order_by("-created_at")
-            .first()
-        )
-        if (
-            old
-            and latest.created_at > twenty_four_hours_ago
-            and float(old.price) > 0
-        ):
-            current_price = float(latest.price)
-            old_price = float(old.price)
-            change_percent = (
-                (current_price - old_price) / old_price
-            ) * 100
-            price_changes.append({
-                "name": price_type.name,
-                "current": current_price,
-                "old": old_price,
-                "change_percent": change_percent,
-                "change_amount": current_price - old_price,
-                "category": (
-                    price_type.category.name
-                    if price_type.category
-                    else "Uncategorized"
-                ),
-            })
-
-    avg_24h_change = (
-        sum(p["change_percent"] for p in price_changes) / len(price_changes)
-        if price_changes
-        else 0
-    )
-    biggest_change = (
-        max(price_changes, key=lambda x: abs(x["change_percent"]))
-        if price_changes
-        else None
-    )
-
-    special_price_types = SpecialPriceType.objects.prefetch_related(
-        Prefetch(
-            "special_price_histories",
-            queryset=SpecialPriceHistory.objects.order_by("-created_at"),
-        )
-    ).select_related("source_currency", "target_currency").all()
-
-    latest_update = (
-        PriceHistory.objects.select_related("price_type")
-        .order_by("-created_at")
-        .first()
+        ).values_list("id", "name")[:10]
     )
-    recent_updates = PriceHistory.objects.filter(
-        created_at__gte=twenty_four_hours_ago
-    ).count()
-
-    top_price_types = (
-        PriceType.objects.annotate(
-            latest_price_count=Count("price_histories")
+    points_by_type = defaultdict(list)
+    for price_type_id, created_at, price in (
+        PriceHistory.objects.filter(
+            price_type_id__in=[price_type_id for price_type_id, _name in top_price_types],
+            created_at__gte=twenty_four_hours_ago,
         )
-        .filter(price_histories__created_at__gte=twenty_four_hours_ago)
-        .distinct()[:10]
-    )
-    chart_data_24h = []
-    for price_type in top_price_types:
-        histories = (
-            price_type.price_histories.filter(
-                created_at__gte=twenty_four_hours_ago
+        .annotate(
+            row_number=Window(
+                RowNumber(), partition_by=F("price_type_id"), order_by=F("created_at").asc()
             )
-            .order_by("created_at")[:50]
         )
-        if histories.count() > 0:
-            chart_data_24h.append({
-                "label": price_type.name,
-                "data": [
-                    {"x": h.created_at.isoformat(), "y": float(h.price)}
-                    for h in histories
-                ],
-            })
+        .filter(row_number__lte=50)
+        .order_by("price_type_id", "created_at")
+        .values_list("price_type_id", "created_at", "price")
+    ):
+        points_by_type[price_type_id].append(
+            {"x": created_at.isoformat(), "y": float(price)}
+        )
+    chart_data_24h = [
+        {"label": name, "data": points_by_type[price_type_id]}
+        for price_type_id, name in top_price_types
+        if points_by_type[price_type_id]
+    ]
+
+    # Per-category averages from one pass over the denormalized latest prices
+    latest_by_category = defaultdict(list)
+    for category_id, latest_price in PriceType.objects.filter(
+        latest_price__isnull=False
+    ).values_list("category_id", "latest_price"):
+        latest_price = float(latest_price)
+        latest_by_category[category_id].append(latest_price)
 
     category_avg_prices = []
-    for category in categories:
-        pts = list(category.price_types.all())
-        latest_prices = []
-        for pt in pts:
-            latest = pt.price_histories.first()
-            if latest:
-                latest_prices.append(float(latest.price))
+    # Base context holds the display-sorted list; keep Meta.ordering (name) here
+    for category in sorted(context["categories"], key=attrgetter("name")):
+        latest_prices = latest_by_category.get(category.id)
         if latest_prices:
             category_avg_prices.append({
                 "name": category.name,
@@ -234,73 +248,51 @@ def get_dashboard2_context():
             })
 
     recent_updates_list = (
-        PriceHistory.objects.select_related(
-            "price_type", "price_type__category"
-        )
-        .order_by("-created_at")[:10]
+        PriceHistory.objects.order_by("-created_at")
+        .values_list(
+            "price", "created_at", "price_type__name", "price_type__category__name"
+        )[:10]
     )
     recent_updates_data = [
         {
-            "price_type": u.price_type.name,
+            "price_type": price_type_name,
             "category": (
-                u.price_type.category.name
-                if u.price_type.category
+                category_name
+                if category_name is not None
                 else "Uncategorized"
             ),
-            "price": float(u.price),
-            "created_at": u.created_at.isoformat(),
-            "time_ago": (
-                str(now - u.created_at).split(".")[0]
-                if u.created_at
-                else ""
-            ),
+            "price": float(price),
+            # json_script's DjangoJSONEncoder writes the ISO string
+            "created_at": created_at,
         }
-        for u in recent_updates_list
+        for price, created_at, price_type_name, category_name in recent_updates_list
     ]
 
-    all_latest_prices = [
-        float(pt.price_histories.first().price)
-        for pt in PriceType.objects.prefetch_related("price_histories").all()
-        if pt.price_histories.exists()
+    # Seven rolling 24h buckets, oldest first, counted in a single query
+    day_bounds = [
+        (now - timedelta(days=day + 1), now - timedelta(days=day))
+        for day in reversed(range(7))
     ]
-
-    update_frequency = []
-    for day in range(7):
-        day_start = now - timedelta(days=day + 1)
-        day_end = now - timedelta(days=day)
-        count = PriceHistory.objects.filter(
-            created_at__gte=day_start,
-            created_at__lt=day_end,
-        ).count()
-        update_frequency.append({
+    day_counts = PriceHistory.objects.filter(
+        created_at__gte=day_bounds[0][0], created_at__lt=now
+    ).aggregate(**{
+        f"day_{index}": Count(
+            "id", filter=Q(created_at__gte=day_start, created_at__lt=day_end)
+        )
+        for index, (day_start, day_end) in enumerate(day_bounds)
+    })
+    update_frequency = [
+        {
             "date": day_start.date().isoformat(),
-            "count": count,
-        })
-    update_frequency.reverse()
+            "count": day_counts[f"day_{index}"],
+        }
+        for index, (day_start, _day_end) in enumerate(day_bounds)
+    ]
 
-    return {
-        "categories": sort_categories(categories),
-        "special_price_types": special_price_types,
-        "highest_price": highest_price,
-        "highest_price_label": highest_price_label,
-        "avg_24h_change": avg_24h_change,
-        "biggest_change": biggest_change,
-        "total_bots": TelegramBot.objects.count(),
-        "active_bots": TelegramBot.objects.filter(is_active=True).count(),
-        "total_channels": TelegramChannel.objects.count(),
-        "active_channels": TelegramChannel.objects.filter(
-            is_active=True
-        ).count(),
-        "total_price_types": PriceType.objects.count(),
-        "total_price_updates": PriceHistory.objects.count(),
-        "latest_update_time": (
-            latest_update.created_at if latest_update else None
-        ),
-        "recent_updates": recent_updates,
-        "price_changes": price_changes,
+    context.update({
         "chart_data_24h_json": chart_data_24h,
         "category_avg_prices_json": category_avg_prices,
         "recent_updates_json": recent_updates_data,
         "update_frequency_json": update_frequency,
-        "price_distribution_json": all_latest_prices,
-    }
+    })
+    return context
@@ -0,0 +1,30 @@
+from django.db.models.signals import post_delete, post_save
+
+from category.models import Category, PriceType
+from change_price.models import PriceHistory
+from special_price.models import SpecialPriceHistory, SpecialPriceType
+from telegram_app.models import TelegramBot, TelegramChannel
+
+from .services import invalidate_dashboard_cache
+
+
+def _invalidate_dashboard_cache(sender, **kwargs):
+    invalidate_dashboard_cache()
+
+
+# Everything the home/dashboard2 contexts read from.
+for _model in (
+    Category,
+    PriceType,
+    PriceHistory,
+    SpecialPriceType,
+    SpecialPriceHistory,
+    TelegramBot,
+    TelegramChannel,
+):
+    for _signal, _signal_name in ((post_save, "save"), (post_delete, "delete")):
+        _signal.connect(
+            _invalidate_dashboard_cache,
+            sender=_model,
+            dispatch_uid=f"dashboard:cache:{_signal_name}:{_model.__name__}",
+        )
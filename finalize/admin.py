@@ -5,6 +5,7 @@ from .models import Finalization, FinalizedPriceHistory, SpecialPriceFinalizatio
 @admin.register(Finalization)
 class FinalizationAdmin(admin.ModelAdmin):
     list_display = ('category', 'channel', 'finalized_at', 'finalized_by', 'message_sent')
+    list_select_related = ('category', 'channel', 'finalized_by')
     list_filter = ('category', 'channel', 'message_sent', 'finalized_at')
     search_fields = ('category__name', 'notes', 'image_caption', 'telegram_response')
     readonly_fields = ('finalized_at',)
@@ -27,6 +28,7 @@ class FinalizationAdmin(admin.ModelAdmin):
 @admin.register(FinalizedPriceHistory)
 class FinalizedPriceHistoryAdmin(admin.ModelAdmin):
     list_display = ('finalization', 'price_history', 'get_category', 'get_price_type')
+    list_select_related = ('finalization__category', 'price_history__price_type')
     list_filter = ('finalization__category', 'finalization__finalized_at')
     search_fields = ('finalization__category__name', 'price_history__price_type__name')
     
@@ -44,6 +46,7 @@ class FinalizedPriceHistoryAdmin(admin.ModelAdmin):
 @admin.register(SpecialPriceFinalization)
 class SpecialPriceFinalizationAdmin(admin.ModelAdmin):
     list_display = ('get_special_price_type', 'channel', 'finalized_at', 'finalized_by', 'message_sent')
+    list_select_related = ('special_price_history__special_price_type', 'channel', 'finalized_by')
     list_filter = ('channel', 'message_sent', 'finalized_at')
     search_fields = ('special_price_history__special_price_type__name', 'notes', 'image_caption', 'telegram_response')
     readonly_fields = ('finalized_at',)
@@ -5,8 +5,9 @@ Usage: python manage.py debug_rates
 import sys
 import io
 from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
 from category.models import Category, PriceType
-from change_price.models import PriceHistory
+from change_price.services import latest_price_histories
 from finalize.services import _build_rates_from_items
 from django.conf import settings
 
@@ -23,20 +24,25 @@ class Command(BaseCommand):
         self.stdout.write(f"  URL: {url}")
         self.stdout.write(f"  KEY: {'SET (' + key[:8] + '...)' if key else 'EMPTY - THIS IS THE PROBLEM!'}")
 
-        categories = Category.objects.all()
+        categories = Category.objects.prefetch_related(
+            Prefetch(
+                "price_types",
+                queryset=PriceType.objects.select_related("source_currency", "target_currency"),
+            )
+        )
+        # Newest history of every price type in one query instead of one per type
+        latest_by_type = latest_price_histories(PriceType.objects.values("id"))
         for cat in categories:
             self.stdout.write(f"\n=== Category: {cat.name} (id={cat.id}) ===")
-            price_types = PriceType.objects.filter(category=cat).select_related(
-                "source_currency", "target_currency"
-            )
+            price_types = cat.price_types.all()
 
-            if not price_types.exists():
+            if not price_types:
                 self.stdout.write("  (no price types)")
                 continue
 
             price_items = []
             for pt in price_types:
-                latest = PriceHistory.objects.filter(price_type=pt).order_by("-created_at").first()
+                latest = latest_by_type.get(pt.id)
                 src = pt.source_currency.code if pt.source_currency else "?"
                 tgt = pt.target_currency.code if pt.target_currency else "?"
                 price_val = latest.price if latest else "NO HISTORY"
@@ -7,12 +7,31 @@ import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
 RATE_KEYS = ("GBP_BUY", "GBP_SELL", "USDT_BUY", "USDT_SELL")
 TIMEOUT_SECONDS = 10
 
+# Shared keep-alive session: the rate POSTs of a finalize (and of later
+# finalizes) reuse pooled connections instead of a new TCP+TLS handshake each.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.headers.update({"Content-Type": "application/json"})
+
+
+# Accepted currency pairs (either direction) -> rate family
+_PAIR_TO_CURRENCY = {
+    frozenset(("GBP", "IRR")): "GBP",
+    frozenset(("GBP", "IRT")): "GBP",
+    frozenset(("USDT", "IRR")): "USDT",
+    frozenset(("USDT", "IRT")): "USDT",
+}
+_USDT_GBP_PAIR = frozenset(("USDT", "GBP"))
+
 
 def _build_rates_from_items(price_items):
     """
@@ -51,16 +70,17 @@ def _build_rates_from_items(price_items):
                 skipped.append(f"Invalid trade_type: {trade_type}")
                 continue
 
-            pair = {source_code, target_code}
+            pair = frozenset((source_code, target_code))
 
             # USDT/GBP: NEVER use — only USDT/IRR (تتر به تومان) is sent
-            if pair == {'USDT', 'GBP'}:
+            if pair == _USDT_GBP_PAIR:
                 skipped.append(
                     f"USDT/GBP skipped (only USDT/IRR sent): {source_code}/{target_code} {trade_type}={price_value}"
                 )
                 continue
 
-            if pair in ({'GBP', 'IRR'}, {'GBP', 'IRT'}):
+            currency = _PAIR_TO_CURRENCY.get(pair)
+            if currency == "GBP":
                 is_account = (
                     "حسابی" in price_type_name
                     or "از حساب" in price_type_name
@@ -71,7 +91,7 @@ def _build_rates_from_items(price_items):
                     continue
                 key = "GBP_BUY" if trade_type == "buy" else "GBP_SELL"
 
-            elif pair in ({'USDT', 'IRR'}, {'USDT', 'IRT'}):
+            elif currency == "USDT":
                 # Skip items whose name indicates GBP/pound (misconfigured pair)
                 if "پوند" in price_type_name or "gbp" in price_type_name or "pound" in price_type_name:
                     skipped.append(
@@ -107,10 +127,9 @@ def _send_one_rate(currency: str, rate: float) -> bool:
         return False
 
     payload = {"currency": currency, "rate": float(rate), "api_key": api_key}
-    headers = {"Content-Type": "application/json"}
 
     try:
-        resp = requests.post(api_url, json=payload, headers=headers, timeout=TIMEOUT_SECONDS)
+        resp = _SESSION.post(api_url, json=payload, timeout=TIMEOUT_SECONDS)
 
         if resp.status_code != 200:
             logger.error(
@@ -130,6 +149,42 @@ def _send_one_rate(currency: str, rate: float) -> bool:
         return False
 
 
+def _send_rates_batch(items_to_send):
+    """
+    Send all rates in one POST. Returns True/False for success/failure, or
+    None when the endpoint does not accept batches (404/405) so the caller
+    can fall back to one POST per rate.
+    """
+    api_url = getattr(settings, "EXTERNAL_API_URL", None)
+    api_key = getattr(settings, "EXTERNAL_API_KEY", None)
+
+    if not api_url or not api_key:
+        logger.error("EXTERNAL_API_URL or EXTERNAL_API_KEY not configured in settings")
+        return False
+
+    payload = {"api_key": api_key, "rates": {key: float(rate) for key, rate in items_to_send}}
+
+    try:
+        resp = _SESSION.post(api_url, json=payload, timeout=TIMEOUT_SECONDS)
+
+        if resp.status_code in (404, 405):
+            logger.info("External API does not accept batch rates (status %s)", resp.status_code)
+            return None
+        if resp.status_code != 200:
+            logger.error(
+                "External API returned status %s for batch %s. Body: %s",
+                resp.status_code, payload["rates"], resp.text
+            )
+            return False
+
+        logger.info("Sent batch %s successfully", payload["rates"])
+        return True
+
+    except requests.exceptions.RequestException as exc:
+        logger.exception("Batch request failed for %s: %s", payload["rates"], exc)
+        return False
+
+
 class ExternalAPIService:
     """Sends finalized prices to external API. Uses price_items values only."""
 
@@ -156,6 +211,17 @@ class ExternalAPIService:
 
         items_to_send = [(k, rates[k]) for k in RATE_KEYS if k in rates]
 
+        if getattr(settings, "EXTERNAL_API_BULK", False):
+            ok = _send_rates_batch(items_to_send)
+            if ok is not None:
+                results = [{"currency": key, "rate": value} for key, value in items_to_send]
+                if ok:
+                    sent = results
+                else:
+                    failed = results
+                logger.info("External API: %d sent, %d failed", len(sent), len(failed))
+                return {"sent": sent, "failed": failed, "skipped": skipped}
+
         with ThreadPoolExecutor(max_workers=len(items_to_send) or 1) as executor:
             futures = {
                 executor.submit(_send_one_rate, key, value): (key, value)
@@ -17,21 +17,18 @@ class ExternalAPIServiceTest(TestCase):
     def setUp(self):
         """Set up test data"""
         # Create currencies
-        self.usdt_currency = Currency.objects.create(
+        self.usdt_currency = Currency.objects.get_or_create(
             code='USDT',
-            name='Tether',
-            symbol='USDT'
-        )
-        self.irr_currency = Currency.objects.create(
+            defaults={'name': 'Tether', 'symbol': 'USDT'}
+        )[0]
+        self.irr_currency = Currency.objects.get_or_create(
             code='IRR',
-            name='Iranian Rial',
-            symbol='IRR'
-        )
-        self.gbp_currency = Currency.objects.create(
+            defaults={'name': 'Iranian Rial', 'symbol': 'IRR'}
+        )[0]
+        self.gbp_currency = Currency.objects.get_or_create(
             code='GBP',
-            name='British Pound',
-            symbol='GBP'
-        )
+            defaults={'name': 'British Pound', 'symbol': 'GBP'}
+        )[0]
 
         # Create category
         self.tether_category = Category.objects.create(
@@ -56,7 +53,7 @@ class ExternalAPIServiceTest(TestCase):
             trade_type='buy'
         )
 
-    @patch('finalize.services.requests.post')
+    @patch('finalize.services._SESSION.post')
     def test_send_usdt_sell_price_150000(self, mock_post):
         """Test sending USDT sell price of 150000 toman"""
         mock_post_response = MagicMock()
@@ -92,7 +89,7 @@ class ExternalAPIServiceTest(TestCase):
         self.assertEqual(results["sent"][0]["currency"], "USDT_SELL")
         self.assertEqual(results["sent"][0]["rate"], 150000.0)
 
-    @patch('finalize.services.requests.post')
+    @patch('finalize.services._SESSION.post')
     def test_send_usdt_buy_and_sell_prices(self, mock_post):
         """Test sending both USDT buy and sell prices"""
         mock_post_response = MagicMock()
@@ -137,7 +134,7 @@ class ExternalAPIServiceTest(TestCase):
         self.assertEqual(rates_sent["USDT_BUY"], 148000.0)
         self.assertEqual(rates_sent["USDT_SELL"], 150000.0)
 
-    @patch('finalize.services.requests.post')
+    @patch('finalize.services._SESSION.post')
     def test_usdt_sell_price_not_overwritten_by_existing_api_value(self, mock_post):
         """Test that USDT_SELL is sent with value from price_items (no API fetch)"""
         mock_post_response = MagicMock()
@@ -182,7 +179,7 @@ class ExternalAPIServiceTest(TestCase):
             "USDT_SELL rate should not be 1.0 (invalid existing value)"
         )
 
-    @patch('finalize.services.requests.post')
+    @patch('finalize.services._SESSION.post')
     def test_usdt_gbp_pair_skipped(self, mock_post):
         """Test that USDT/GBP pairs are NOT sent (only USDT/IRR)"""
         usdt_gbp_type = PriceType.objects.create(
@@ -204,7 +201,7 @@ class ExternalAPIServiceTest(TestCase):
         self.assertGreater(len(results["skipped"]), 0)
         self.assertEqual(mock_post.call_count, 0, "No POST for USDT/GBP")
 
-    @patch('finalize.services.requests.post')
+    @patch('finalize.services._SESSION.post')
     def test_gbp_account_only_sent(self, mock_post):
         """Test that only GBP account (حسابی) is sent, not cash"""
         gbp_account_type = PriceType.objects.create(
@@ -234,3 +231,44 @@ class ExternalAPIServiceTest(TestCase):
         self.assertEqual(results["sent"][0]["currency"], "GBP_BUY")
         self.assertEqual(results["sent"][0]["rate"], 163000.0)
         self.assertEqual(mock_post.call_count, 1, "Only GBP account sent")
+
+    @override_settings(EXTERNAL_API_BULK=True)
+    @patch('finalize.services._SESSION.post')
+    def test_bulk_mode_sends_one_post(self, mock_post):
+        """Test that EXTERNAL_API_BULK sends all rates in a single POST"""
+        mock_post.return_value = MagicMock(status_code=200)
+
+        price_items = [
+            (self.usdt_buy_price_type, PriceHistory.objects.create(price_type=self.usdt_buy_price_type, price=Decimal('126000'))),
+            (self.usdt_sell_price_type, PriceHistory.objects.create(price_type=self.usdt_sell_price_type, price=Decimal('150000')))
+        ]
+
+        results = ExternalAPIService.send_finalized_prices(price_items)
+
+        self.assertEqual(mock_post.call_count, 1, "One POST for all rates")
+        self.assertEqual(
+            mock_post.call_args[1]['json']['rates'],
+            {'USDT_BUY': 126000.0, 'USDT_SELL': 150000.0}
+        )
+        self.assertEqual(len(results["sent"]), 2)
+
+    @override_settings(EXTERNAL_API_BULK=True)
+    @patch('finalize.services._SESSION.post')
+    def test_bulk_mode_falls_back_when_unsupported(self, mock_post):
+        """Test that a 405 on the batch POST falls back to one POST per rate"""
+        mock_post.side_effect = [
+            MagicMock(status_code=405),
+            MagicMock(status_code=200),
+            MagicMock(status_code=200),
+        ]
+
+        price_items = [
+            (self.usdt_buy_price_type, PriceHistory.objects.create(price_type=self.usdt_buy_price_type, price=Decimal('126000'))),
+            (self.usdt_sell_price_type, PriceHistory.objects.create(price_type=self.usdt_sell_price_type, price=Decimal('150000')))
+        ]
+
+        results = ExternalAPIService.send_finalized_prices(price_items)
+
+        self.assertEqual(mock_post.call_count, 3)
+        self.assertEqual(len(results["sent"]), 2)
+        self.assertEqual(len(results["failed"]), 0)
@@ -19,7 +19,7 @@ from .models import Finalization, FinalizedPriceHistory, SpecialPriceFinalizatio
 from .services import ExternalAPIService
 from setting.utils import log_finalize_event, log_telegram_event
 from core.sorting import (
-    sort_categories,
+    order_categories,
     price_types_for_finalize,
     is_tether_category,
 )
@@ -49,7 +49,8 @@ def finalize_dashboard(request):
                 'source_currency', 'target_currency'
             )
         )
-    ).all()
+    )
+    categories = order_categories(categories)
     
     # Find prices that are not finalized yet
     # A price is not finalized if there's a PriceHistory entry that doesn't have a FinalizedPriceHistory
@@ -117,18 +118,11 @@ def finalize_dashboard(request):
                     'special_price_history': latest_price
                 })
     
-    sorted_categories = sort_categories(categories)
-
-    # Re-order pending_by_category to match sorted category order
-    sorted_pending = {}
-    for cat in sorted_categories:
-        if cat in pending_by_category:
-            sorted_pending[cat] = pending_by_category[cat]
-
+    # pending_by_category was filled in category order already
     context = {
-        'categories': sorted_categories,
-        'pending_by_category': sorted_pending,
-        'has_pending': len(sorted_pending) > 0,
+        'categories': categories,
+        'pending_by_category': pending_by_category,
+        'has_pending': len(pending_by_category) > 0,
         'pending_special_prices': pending_special_prices,
         'has_pending_special': len(pending_special_prices) > 0,
         'special_price_types': special_price_types,
@@ -231,7 +225,7 @@ def finalize_category(request, category_id):
         api_sent_successfully = False
         api_results = None
         try:
-            logger.info(f"=== Starting API sync for category: {category.name} ===")
+            logger.info("=== Starting API sync for category: %s ===", category.name)
             api_results = ExternalAPIService.send_finalized_prices(price_items)
             sent_count = len(api_results.get("sent", []))
             failed_count = len(api_results.get("failed", []))
@@ -240,25 +234,28 @@ def finalize_category(request, category_id):
 
             if sent_count > 0:
                 logger.info(
-                    f"✓ Successfully sent {sent_count} external rate request(s) "
-                    f"for category: {category.name}"
+                    "✓ Successfully sent %d external rate request(s) for category: %s",
+                    sent_count, category.name,
                 )
                 # Log each sent rate
-                for sent_item in api_results.get("sent", []):
-                    currency = sent_item.get("currency", "N/A")
-                    rate = sent_item.get("rate", "N/A")
-                    logger.info(f"  → Sent {currency} = {rate}")
+                if logger.isEnabledFor(logging.INFO):
+                    for sent_item in api_results.get("sent", []):
+                        logger.info(
+                            "  → Sent %s = %s",
+                            sent_item.get("currency", "N/A"), sent_item.get("rate", "N/A"),
+                        )
             
             if failed_count > 0:
                 logger.warning(
-                    f"✗ Failed to send {failed_count} external rate request(s) "
-                    f"for category: {category.name}"
+                    "✗ Failed to send %d external rate request(s) for category: %s",
+                    failed_count, category.name,
                 )
                 # Log each failed rate
                 for failed_item in api_results.get("failed", []):
-                    currency = failed_item.get("currency", "N/A")
-                    rate = failed_item.get("rate", "N/A")
-                    logger.warning(f"  → Failed: {currency} = {rate}")
+                    logger.warning(
+                        "  → Failed: %s = %s",
+                        failed_item.get("currency", "N/A"), failed_item.get("rate", "N/A"),
+                    )
 
             # Structured log into system log table
             external_log_level = "INFO" if failed_count == 0 else "WARNING"
@@ -296,7 +293,8 @@ def finalize_category(request, category_id):
                 
         except Exception as exc:
             logger.error(
-                f"✗✗✗ CRITICAL: Error sending prices to external API for category {category.name}: {exc}",
+                "✗✗✗ CRITICAL: Error sending prices to external API for category %s: %s",
+                category.name, exc,
                 exc_info=True
             )
             log_finalize_event(
@@ -553,13 +551,13 @@ def finalize_special_price(request, special_price_history_id):
 
             if sent_count:
                 logger.info(
-                    f"Successfully sent {sent_count} external rate request(s) "
-                    f"for special price: {special_price_type.name}"
+                    "Successfully sent %d external rate request(s) for special price: %s",
+                    sent_count, special_price_type.name,
                 )
             if failed_count:
                 logger.warning(
-                    f"Failed to send {failed_count} external rate request(s) "
-                    f"for special price: {special_price_type.name}"
+                    "Failed to send %d external rate request(s) for special price: %s",
+                    failed_count, special_price_type.name,
                 )
 
             external_log_level = "INFO" if failed_count == 0 else "WARNING"
@@ -574,7 +572,8 @@ def finalize_special_price(request, special_price_history_id):
             )
         except Exception as exc:
             logger.error(
-                f"Error sending special price to external API {special_price_type.name}: {exc}"
+                "Error sending special price to external API %s: %s",
+                special_price_type.name, exc,
             )
             log_finalize_event(
                 level="ERROR",
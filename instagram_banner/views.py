@@ -9,7 +9,7 @@ from django.utils import timezone
 
 from category.models import Category, PriceType
 from change_price.models import PriceHistory
-from core.sorting import sort_categories, sort_price_types_by_category
+from core.sorting import order_categories, sort_price_types_by_category
 from .services import generate_story_banner, generate_post_banner
 
 logger = logging.getLogger(__name__)
@@ -41,12 +41,10 @@ def generator_page(request):
                 "source_currency", "target_currency"
             ),
         )
-    ).all()
-
-    sorted_cats = sort_categories(categories)
+    )
 
     context = {
-        "categories": sorted_cats,
+        "categories": order_categories(categories),
     }
     return render(request, "instagram_banner/generator.html", context)
 
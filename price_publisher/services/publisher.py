@@ -7,7 +7,6 @@ from dataclasses import dataclass
 from typing import Iterable, Optional
 
 from django.utils import timezone
-import jdatetime
 
 from PIL import Image
 
@@ -84,12 +83,8 @@ TEMPLATE_TYPE_MAP = {
     "special_sell_account_GBP.jpg": (True, True),
 }
 
-from core.formatting import (
-    FARSI_MONTHS,
-    FARSI_WEEKDAYS,
-    PERSIAN_DIGITS,
-    format_price_dynamic,
-)
+from core.dates import format_all
+from core.formatting import format_price_dynamic
 
 # Contact information (Maria removed - Sogand in slot 2)
 CONTACT_INFO = {
@@ -555,19 +550,9 @@ class PricePublisherService:
     @staticmethod
     def _format_dates(timestamp) -> tuple[str, str, str, str]:
         """Format Persian and English dates from timestamp. Returns (farsi_date, farsi_weekday, english_date, english_weekday)."""
-        now = timezone.localtime(timestamp) if timestamp else timezone.localtime()
-        jalali = jdatetime.datetime.fromgregorian(datetime=now)
-        
-        farsi_date = f"{jalali.day} {FARSI_MONTHS[jalali.month]} {jalali.year}"
-        farsi_weekday = FARSI_WEEKDAYS.get(now.strftime("%A"), "")
-        # Format English date with zero-padded day: "December 04, 2025"
-        english_date = now.strftime("%B %d, %Y")
-        english_weekday = now.strftime("%A")
-        
-        # Convert English digits to Persian
-        farsi_date = farsi_date.translate(PERSIAN_DIGITS)
-        
-        return farsi_date, farsi_weekday, english_date, english_weekday
+        # English date keeps the zero-padded day: "December 04, 2025"
+        labels = format_all(timestamp)
+        return labels.persian_date, labels.farsi_weekday, labels.english_date, labels.english_weekday
     
     @staticmethod
     def _build_contact_section() -> str:
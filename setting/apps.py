@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SettingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'setting'
+
+    def ready(self):
+        # Import signal handlers
+        from . import signals  # noqa: F401
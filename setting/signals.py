@@ -0,0 +1,15 @@
+from django.core.signals import request_finished, request_started
+
+from .utils import flush_deferred_logs, start_deferred_logs
+
+
+def _start_deferred_logs(sender, **kwargs):
+    start_deferred_logs()
+
+
+def _flush_deferred_logs(sender, **kwargs):
+    flush_deferred_logs()
+
+
+request_started.connect(_start_deferred_logs, dispatch_uid="setting:deferred_logs:start")
+request_finished.connect(_flush_deferred_logs, dispatch_uid="setting:deferred_logs:flush")
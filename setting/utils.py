@@ -1,8 +1,19 @@
 """
 Utility functions for logging application events.
 """
+import logging
+import threading
+
+from django.db import close_old_connections
+
 from .models import Log
 
+logger = logging.getLogger(__name__)
+
+# Per-thread queue of unsaved Log rows for the request being served;
+# None outside a request (see setting.signals).
+_deferred = threading.local()
+
 
 def log_event(level='INFO', source='system', message='', details=None, user=None):
     """
@@ -27,6 +38,41 @@ def log_event(level='INFO', source='system', message='', details=None, user=None
     )
 
 
+def defer_log_event(level='INFO', source='system', message='', details=None, user=None):
+    """
+    Same as log_event, but inside a request the row is queued and written
+    with the request's other deferred logs in one bulk INSERT once the
+    response has been sent. Outside a request it is written immediately.
+    """
+    pending = getattr(_deferred, 'logs', None)
+    if pending is None:
+        return log_event(level=level, source=source, message=message, details=details, user=user)
+    entry = Log(level=level, source=source, message=message, details=details, user=user)
+    pending.append(entry)
+    return entry
+
+
+def start_deferred_logs():
+    """Open an empty deferred-log queue for the current request."""
+    _deferred.logs = []
+
+
+def flush_deferred_logs():
+    """Write and close the current request's deferred-log queue."""
+    pending = getattr(_deferred, 'logs', None)
+    _deferred.logs = None
+    if not pending:
+        return
+    try:
+        Log.objects.bulk_create(pending)
+    except Exception:
+        logger.exception("Failed to write %d deferred log entries", len(pending))
+    finally:
+        # Runs after Django's own request_finished cleanup; release the
+        # connection the insert reopened (honours CONN_MAX_AGE like Django does).
+        close_old_connections()
+
+
 def log_telegram_event(level='INFO', message='', details=None, user=None):
     """Convenience function to log Telegram events."""
     return log_event(level=level, source='telegram', message=message, details=details, user=user)